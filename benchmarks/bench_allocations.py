@@ -0,0 +1,83 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Obstacle Loop Allocation Check
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Uses tracemalloc snapshots to check that scrolling obstacles and checking collisions allocates nothing
+#              per frame in the engine. Headless, run from the repository root: python benchmarks/bench_allocations.py
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from running_sim_engine import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+frames = 200
+
+# Frames run before measuring, enough for the mistake counts to pass the ints Python keeps cached
+warmUpFrames = 300
+
+# Only allocations made by these files count, so the interpreter and tracemalloc itself can't fail the check
+checkedFiles = ("*running_sim_engine.py", "*running_sim_collision.py")
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def obstacleFrame(state):
+    """The per frame obstacle work: scroll and cull the obstacles and check every character against them. Returns
+    the list of characters hit."""
+    state.obstacles.advance(backgroundSpeed * tickSeconds)
+    return checkCollision(state)
+
+
+def measure(frameCount=frames):
+    """Returns the lines of the engine and collision modules that hold more blocks after frameCount obstacle frames
+    than before them, as (line, new blocks, new bytes). What each frame returns is kept until the second snapshot,
+    so a frame that builds a new hit list (or anything it hands back) instead of reusing one shows up."""
+    state = GameState("multiplayer", seed=0)
+
+    # Both characters stand where a hit sends them and obstacles stream past from the first frame, so every frame
+    # after the first few looks the same (both hit together, the same leader, obstacles culled off the left)
+    state.addCharacter(Character(20, 395, "Jamir", runSpeed, ("w", "a", "s", "d"), 3))
+    state.addCharacter(Character(20, 395, "Jamir", runSpeed, ("8", "4", "5", "6"), 3))
+    for i in range(120):
+        state.obstacles.spawn(i % len(obstacleKinds), 60 + i * 60)
+
+    # Warm up while tracing, so the values a frame replaces (and the first hit, leader and so on) are traced before
+    # the first snapshot and only growth counts
+    filters = [tracemalloc.Filter(True, pattern) for pattern in checkedFiles]
+    results = [None] * frameCount
+    tracemalloc.start()
+    for i in range(warmUpFrames):
+        obstacleFrame(state)
+    before = tracemalloc.take_snapshot().filter_traces(filters)
+    for i in range(frameCount):
+        results[i] = obstacleFrame(state)
+    after = tracemalloc.take_snapshot().filter_traces(filters)
+    tracemalloc.stop()
+
+    return [(str(stat.traceback), stat.count_diff, stat.size_diff)
+            for stat in after.compare_to(before, "lineno") if stat.count_diff > 0]
+
+
+def main():
+    """Runs the check and prints the results, exits with an error if the obstacle loop allocates."""
+    grown = measure()
+    print("obstacle loop over {} frames: {} new blocks in the engine".format(frames, sum(stat[1] for stat in grown)))
+    if grown:
+        for line, blocks, size in grown:
+            print("  {}: {} blocks, {} bytes".format(line, blocks, size))
+        print("FAIL: the obstacle loop allocates per frame")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
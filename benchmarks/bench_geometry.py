@@ -0,0 +1,54 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Geometry Primitive Benchmark
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Compares memory per object and construction time of the drawable graphics.Point with the
+#              __slots__ graphics.Vector. Run from the repository root: python benchmarks/bench_geometry.py
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphics import Point, Vector
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+objectCount = 100000
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def bytesPerObject(cls, count=objectCount):
+    """Returns the average memory held by each of count instances of cls."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls(i, i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Don't count the list holding them
+    listSize = sys.getsizeof(objects)
+    return (after - before - listSize) / count
+
+
+def constructionTime(cls, count=objectCount):
+    """Returns the average seconds taken to construct one instance of cls."""
+    return min(timeit.repeat(lambda: cls(1, 2), number=count, repeat=5)) / count
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    for cls in (Point, Vector):
+        print("{:6} {:8.1f} bytes/object {:8.1f} ns/construction".format(
+            cls.__name__, bytesPerObject(cls), constructionTime(cls) * 1e9))
+
+
+if __name__ == "__main__":
+    main()
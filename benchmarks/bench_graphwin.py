@@ -0,0 +1,55 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: GraphWin Item Churn Benchmark
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Draws and undraws 10k items to time the GraphWin item registry. Needs a display (or Xvfb).
+#              Run from the repository root: python benchmarks/bench_graphwin.py
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphics import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+itemCount = 10000
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def churn(window, count=itemCount):
+    """Draws count items, then undraws them oldest first, returns (draw seconds, undraw seconds)."""
+    items = [Rectangle(Point(i % 1000, i // 1000), Point(i % 1000 + 2, i // 1000 + 2)) for i in range(count)]
+
+    start = time.perf_counter()
+    for item in items:
+        item.draw(window)
+    drawn = time.perf_counter()
+
+    # Undrawing the oldest item first was the worst case for the old list registry
+    for item in items:
+        item.undraw()
+    undrawn = time.perf_counter()
+
+    return drawn - start, undrawn - drawn
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    window = GraphWin("GraphWin Churn", 1000, 20, autoflush=False)
+    drawTime, undrawTime = churn(window)
+    window.close()
+
+    print("draw   {} items: {:8.2f} ms".format(itemCount, drawTime * 1000))
+    print("undraw {} items: {:8.2f} ms".format(itemCount, undrawTime * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Recording Window for Headless Benchmarks
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: A GraphWin that keeps its canvas items in Python instead of Tk, and a PhotoImage stand-in that keeps
+#              the PIL image instead of uploading it to Tk. With them installed the drawing benchmarks run without a
+#              display: they time graphics.py, the sprites and Pillow's resizing, but not Tk's own drawing or pixel
+#              uploads. Every canvas call is counted in RecordingWindow.calls.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import os
+import sys
+import tkinter
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import graphics
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class RecordingRoot:
+    """Stands in for the hidden Tk root, there is nothing to update."""
+    def update(self):
+        """Does nothing."""
+        pass
+
+
+class RecordingPhotoImage:
+    """Stands in for both tkinter.PhotoImage and PIL.ImageTk.PhotoImage, keeping the PIL image it was made from."""
+    def __init__(self, image=None, master=None, width=0, height=0, file=None):
+        """Constructs a photo image from a PIL image, a file or an empty width by height size."""
+        if file is not None:
+            image = graphics.PILIMage.open(file)
+        self.pilImage = image
+        if image is not None:
+            width, height = image.size
+        self.size = (int(width), int(height))
+        self.pixels = {}
+
+    def width(self):
+        """Returns the width in pixels."""
+        return self.size[0]
+
+    def height(self):
+        """Returns the height in pixels."""
+        return self.size[1]
+
+    def copy(self):
+        """Returns a separate photo image with the same pixels."""
+        other = RecordingPhotoImage(self.pilImage, width=self.size[0], height=self.size[1])
+        other.pixels = dict(self.pixels)
+        return other
+
+    def put(self, data, to):
+        """Records a pixel written at to=(x, y)."""
+        self.pixels[to] = data
+
+    def get(self, x, y):
+        """Returns the color of pixel (x, y) as an (r, g, b) tuple."""
+        if (x, y) in self.pixels:
+            return self.pixels[(x, y)]
+        if self.pilImage is None:
+            return (0, 0, 0)
+        return self.pilImage.convert("RGB").getpixel((x, y))
+
+
+class RecordingTk:
+    """The tkinter module as graphics.py sees it, with PhotoImage swapped for RecordingPhotoImage."""
+    PhotoImage = RecordingPhotoImage
+
+    def __getattr__(self, name):
+        """Returns everything else from tkinter."""
+        return getattr(tkinter, name)
+
+
+class RecordingImageTk:
+    """PIL.ImageTk as graphics.py sees it."""
+    PhotoImage = RecordingPhotoImage
+
+
+class RecordingWindow(graphics.GraphWin):
+    """A GraphWin whose canvas items are dictionaries of coordinates, tags and options."""
+    def __init__(self, title="Graphics Window", width=200, height=200, autoflush=True):
+        """Constructs a window without creating any Tk widget."""
+        self.title = title
+        self.width = int(width)
+        self.height = int(height)
+        self.autoflush = autoflush
+        self.foreground = "black"
+        self.items = {}
+        self.keys = set()
+        self.trans = None
+        self.closed = False
+
+        # Canvas items by id in stacking order, the ids carrying each tag and a count of every canvas call
+        self.canvasItems = {}
+        self.tagged = {}
+        self.nextId = 1
+        self.calls = Counter()
+
+    def __repr__(self):
+        """Returns a description of the window."""
+        return "RecordingWindow('{}', {}, {})".format(self.title, self.width, self.height)
+
+    def close(self):
+        """Closes the window."""
+        self.closed = True
+
+    def update(self):
+        """Does nothing, there is no display to bring up to date."""
+        self.calls["update"] += 1
+
+    def findIds(self, tagOrId):
+        """Returns the ids of the items with the tag, or the one item with the id."""
+        if tagOrId in self.canvasItems:
+            return (tagOrId,)
+        return tuple(self.tagged.get(tagOrId, ()))
+
+    def createItem(self, kind, coords, options):
+        """Records a new canvas item and returns its id."""
+        self.calls["create_" + kind] += 1
+        itemId = self.nextId
+        self.nextId = self.nextId + 1
+        self.canvasItems[itemId] = {"kind": kind, "coords": list(coords), "tags": set(), "options": dict(options)}
+        return itemId
+
+    def create_image(self, x, y, **options):
+        return self.createItem("image", (x, y), options)
+
+    def create_rectangle(self, x1, y1, x2, y2, options={}, **extra):
+        return self.createItem("rectangle", (x1, y1, x2, y2), dict(options, **extra))
+
+    def create_oval(self, x1, y1, x2, y2, options={}, **extra):
+        return self.createItem("oval", (x1, y1, x2, y2), dict(options, **extra))
+
+    def create_line(self, *args, **extra):
+        coords, options = ((args[:-1], args[-1]) if args and isinstance(args[-1], dict) else (args, {}))
+        return self.createItem("line", coords, dict(options, **extra))
+
+    def create_polygon(self, *args, **extra):
+        coords, options = ((args[:-1], args[-1]) if args and isinstance(args[-1], dict) else (args, {}))
+        return self.createItem("polygon", coords, dict(options, **extra))
+
+    def create_text(self, x, y, options={}, **extra):
+        return self.createItem("text", (x, y), dict(options, **extra))
+
+    def coords(self, tagOrId, *coords):
+        self.calls["coords"] += 1
+        for itemId in self.findIds(tagOrId):
+            self.canvasItems[itemId]["coords"] = list(coords)
+
+    def move(self, tagOrId, dx, dy):
+        self.calls["move"] += 1
+        for itemId in self.findIds(tagOrId):
+            itemCoords = self.canvasItems[itemId]["coords"]
+            for i in range(0, len(itemCoords), 2):
+                itemCoords[i] += dx
+                itemCoords[i + 1] += dy
+
+    def itemconfig(self, tagOrId, options={}, **extra):
+        self.calls["itemconfig"] += 1
+        for itemId in self.findIds(tagOrId):
+            self.canvasItems[itemId]["options"].update(options, **extra)
+
+    def delete(self, tagOrId):
+        self.calls["delete"] += 1
+        for itemId in self.findIds(tagOrId):
+            for tag in self.canvasItems.pop(itemId)["tags"]:
+                self.tagged[tag].discard(itemId)
+
+    def tag_raise(self, tagOrId):
+        self.calls["tag_raise"] += 1
+        for itemId in self.findIds(tagOrId):
+            self.canvasItems[itemId] = self.canvasItems.pop(itemId)
+
+    def addtag_withtag(self, newTag, tagOrId):
+        self.calls["addtag_withtag"] += 1
+        for itemId in self.findIds(tagOrId):
+            self.canvasItems[itemId]["tags"].add(newTag)
+            self.tagged.setdefault(newTag, set()).add(itemId)
+
+    def dtag(self, tagOrId, tag):
+        self.calls["dtag"] += 1
+        for itemId in self.findIds(tagOrId):
+            self.canvasItems[itemId]["tags"].discard(tag)
+            self.tagged.get(tag, set()).discard(itemId)
+
+    def config(self, **options):
+        self.calls["config"] += 1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def installRecordingDisplay():
+    """Points graphics at the recording root and photo images, so nothing it does afterwards needs Tk. Images that
+    were already made with Tk are dropped from the transform cache. Does nothing if already installed."""
+    if isinstance(graphics._root, RecordingRoot):
+        return
+    graphics._root = RecordingRoot()
+    graphics.tk = RecordingTk()
+    graphics.PILImageTK = RecordingImageTk
+    graphics.transformCache.clear()
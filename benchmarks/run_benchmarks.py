@@ -0,0 +1,404 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Benchmark Suite
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Times the hot paths of the game, saves the results as JSON and compares them against a stored
+#              baseline. Benchmarks that draw need Pillow and are skipped without it. They draw into a recording
+#              window (see recording_window.py) so they run without a display; --display draws into a real Tk window
+#              instead (use Xvfb on a server: xvfb-run python ...). Run from the repository root:
+#              python benchmarks/run_benchmarks.py [--save results.json] [--baseline benchmarks/baseline.json]
+#                                                  [--update-baseline] [--tolerance 0.4] [--runs 1] [--display]
+#              Timings are scaled by a reference workload timed next to them (see scaledRepeats()), record the
+#              baseline with --runs 3 so it is the median of several runs.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+benchmarkDirectory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchmarkDirectory))
+
+from running_sim_engine import *
+from running_sim_scores import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+defaultBaseline = os.path.join(benchmarkDirectory, "baseline.json")
+
+# How many times each measurement is repeated, the median repeat is kept
+repeats = 9
+
+# Seconds one call of reference() took on the machine the baseline was recorded on, and how many calls are timed
+# after each repeat. Each repeat is scaled by how long reference() took right after it, so a machine that slows down
+# for a few seconds (other load, frequency scaling) doesn't show up as a regression
+referenceSeconds = 2.9e-4
+referenceCalls = 20
+
+# Registered benchmarks as (name, function, needs a display)
+benchmarks = []
+
+# Whether the drawing benchmarks use a real Tk window instead of a recording window, set by --display
+drawOnDisplay = False
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def benchmark(needsDisplay=False):
+    """Registers a benchmark function, the function returns a dictionary of metric name to seconds per operation."""
+    def register(function):
+        benchmarks.append((function.__name__, function, needsDisplay))
+        return function
+    return register
+
+
+def reference():
+    """A fixed pure Python workload that stands in for how fast the machine is running right now."""
+    total = 0
+    values = {}
+    for i in range(2000):
+        values[i & 63] = total
+        total += i * 3 % 7
+    return total
+
+
+def referenceTime():
+    """Returns the seconds one call of reference() takes right now."""
+    start = time.perf_counter()
+    for i in range(referenceCalls):
+        reference()
+    return (time.perf_counter() - start) / referenceCalls
+
+
+def scaledRepeats(measure):
+    """Calls measure() once per repeat, it returns a tuple of seconds. Returns the median of each, with every repeat
+    scaled to the machine that ran reference() in referenceSeconds."""
+    samples = []
+    for i in range(repeats):
+        seconds = measure()
+        scale = referenceSeconds / referenceTime()
+        samples.append([value * scale for value in seconds])
+    return tuple(statistics.median(column) for column in zip(*samples))
+
+
+def timePerCall(function, number):
+    """Returns the median average seconds per call of function over several repeats (see scaledRepeats())."""
+    def measure():
+        start = time.perf_counter()
+        for j in range(number):
+            function()
+        return ((time.perf_counter() - start) / number,)
+    return scaledRepeats(measure)[0]
+
+
+def multiplayerState(players=2, seed=0):
+    """Returns a multiplayer game state with a character for each player, bound to the player's row of controls."""
+    state = GameState("multiplayer", seed)
+    for player in range(players):
+        state.addCharacter(Character(100 + player * 110, 395, "Jamir", runSpeed, playerControls[player], 3))
+    return state
+
+
+def openWindow():
+    """Returns the graphics module and a game window, a recording window unless --display was given. Raises if
+    Pillow is missing or there is no display for --display."""
+    import graphics
+    if not graphics.importedPillow:
+        raise RuntimeError("Pillow is not installed")
+    if drawOnDisplay:
+        return graphics, graphics.GraphWin("Benchmark", worldWidth, worldHeight, autoflush=False)
+
+    from recording_window import RecordingWindow, installRecordingDisplay
+    installRecordingDisplay()
+    return graphics, RecordingWindow("Benchmark", worldWidth, worldHeight, autoflush=False)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Headless Benchmarks
+
+
+@benchmark()
+def collisionScaling():
+    """Collision checks for 8 characters against a growing number of obstacles. Uses findCollisions() directly so
+    hits don't move the characters between calls."""
+    characters = [Character(100 + i * 100, 395, "Jamir", runSpeed, ("w", "a", "s", "d"), 3) for i in range(8)]
+    hit = []
+    box = AABB()
+    results = {}
+    for count in (10, 100, 1000, 10000):
+        field = ObstacleField()
+        for i in range(count):
+            field.spawn(i % len(obstacleKinds), -40 + i * 30)
+        results["obstacles={}".format(count)] = timePerCall(lambda: findCollisions(characters, field, hit, box), 10000)
+    return results
+
+
+@benchmark()
+def headlessFrames():
+    """Full engine ticks with no rendering, reported as seconds per tick."""
+    state = multiplayerState()
+    keys = {"d", "6"}
+    return {"tick": timePerCall(lambda: step(state, keys), 20000)}
+
+
+@benchmark()
+def playerScaling():
+    """Full engine ticks with 2, 4 and 8 players all holding a key, and resolving their input on its own."""
+    results = {}
+    for players in (2, 4, 8):
+        state = multiplayerState(players)
+        keys = {controls[3] for controls in playerControls[:players]}
+        results["tick/players={}".format(players)] = timePerCall(lambda: step(state, keys), 20000)
+        results["input/players={}".format(players)] = timePerCall(lambda: state.resolveInput(keys), 20000)
+    return results
+
+
+@benchmark()
+def importTime():
+    """Importing the sprite layer (and graphics with it) in a fresh interpreter. The Tk root is created lazily, so this
+    doesn't need a display."""
+    command = [sys.executable, "-c", "import time; start = time.perf_counter(); import running_sim_objects; "
+                                     "print(time.perf_counter() - start)"]
+
+    def measure():
+        output = subprocess.run(command, cwd=os.path.dirname(benchmarkDirectory), check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        return (float(output),)
+    return {"running_sim_objects": scaledRepeats(measure)[0]}
+
+
+@benchmark()
+def scoreLoad():
+    """Reading the best scores from a 100k run log, before it is compacted and after."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scores.dat")
+        with open(path, "wb") as logFile:
+            logFile.write(scoresHeader.pack(scoresMagic, scoresVersion, 0, 0))
+            logFile.write(b"".join(packScore(i * 7919 % 500, "Jamir", when=i) for i in range(100000)))
+        results["uncompacted"] = timePerCall(lambda: readLog(path), 5)
+
+        store = ScoreStore(path)
+        store.close()
+        results["compacted"] = timePerCall(lambda: readLog(path), 100)
+    return results
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Display Benchmarks
+
+
+@benchmark(needsDisplay=True)
+def characterDraw():
+    """CharacterSprite.draw() for every state and direction."""
+    from running_sim_objects import CharacterSprite
+    graphics, window = openWindow()
+    character = Character(512, 395, "Jamir", runSpeed, ("w", "a", "s", "d"), 3)
+    sprite = CharacterSprite(character, window)
+
+    results = {}
+    for state in range(len(characterStates)):
+        for direction in range(len(directionNames)):
+            character.setState(state, direction)
+            frameCount = characterStates[state].frameCount
+
+            def draw():
+                character.imageCycle = (character.imageCycle + 1) % frameCount
+                sprite.draw()
+            results["{}/{}".format(characterStates[state].name, directionNames[direction])] = timePerCall(draw, 500)
+    window.close()
+    return results
+
+
+@benchmark(needsDisplay=True)
+def obstacleDraw():
+    """Drawing every obstacle for one frame with 1, 10 and 100 obstacles on the screen, moving each sprite and
+    scrolling them all as one group."""
+    from running_sim_objects import ObstacleSprite
+    graphics, window = openWindow()
+
+    results = {}
+    for count in (1, 10, 100):
+        field = ObstacleField()
+        for i in range(count):
+            field.spawn(i % len(obstacleKinds), 100 + i * 9)
+        world = graphics.Group(window, "world")
+        sprites = [ObstacleSprite(obstacleKinds[field.kind[i]], field.x(i), field.y[i], window, world)
+                   for i in range(count)]
+        for i in range(count):
+            sprites[i].draw(field.x(i))
+
+        # Scroll back and forth so nothing is culled while measuring
+        direction = [1]
+
+        def frame():
+            field.scroll += backgroundSpeed * tickSeconds * direction[0]
+            direction[0] = -direction[0]
+            for i in range(count):
+                sprites[i].draw(field.x(i))
+        results["obstacles={}".format(count)] = timePerCall(frame, 200)
+
+        def groupFrame():
+            world.move(-backgroundSpeed * tickSeconds * direction[0], 0)
+            field.scroll += backgroundSpeed * tickSeconds * direction[0]
+            direction[0] = -direction[0]
+            for i in range(count):
+                sprites[i].draw(field.x(i))
+        results["obstacles={}/group".format(count)] = timePerCall(groupFrame, 200)
+
+        for sprite in sprites:
+            sprite.undraw()
+    window.close()
+    return results
+
+
+@benchmark(needsDisplay=True)
+def imageTransform():
+    """Image.transform() at the character scale with an empty cache and with the result already cached."""
+    graphics, window = openWindow()
+    image = graphics.Image(graphics.Point(0, 0), "assets/images/characters/Jamir/Jamir-upLeft.png")
+
+    def cold():
+        graphics.transformCache.clear()
+        image.transform(3)
+    results = {"cold": timePerCall(cold, 50), "cached": timePerCall(lambda: image.transform(3), 5000)}
+    window.close()
+    return results
+
+
+@benchmark(needsDisplay=True)
+def graphWinChurn():
+    """Drawing and undrawing 10k rectangles."""
+    from bench_graphwin import churn
+    graphics, window = openWindow()
+    drawTime, undrawTime = scaledRepeats(lambda: churn(window))
+    window.close()
+    return {"draw": drawTime / 10000, "undraw": undrawTime / 10000}
+
+
+@benchmark(needsDisplay=True)
+def frameScaling():
+    """Whole game frames with 2, 4 and 8 players: an engine tick, then the frame running_sim_game.py draws with
+    WorldRenderer (characters, background tiles, obstacles and the HUD)."""
+    from running_sim_objects import WorldRenderer
+    graphics, window = openWindow()
+
+    results = {}
+    for players in (2, 4, 8):
+        state = multiplayerState(players)
+        keys = {controls[3] for controls in playerControls[:players]}
+        renderer = WorldRenderer(state, window)
+        for character in state.characters:
+            renderer.addCharacter(character)
+        renderer.createBackground()
+        renderer.drawBackground()
+
+        def frame():
+            step(state, keys)
+            renderer.draw()
+            window.update()
+        results["frame/players={}".format(players)] = timePerCall(frame, 2000)
+        renderer.undraw()
+    window.close()
+    return results
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main
+
+
+def runAll():
+    """Runs every benchmark, returns the results dictionary."""
+    results = {"python": platform.python_version(), "platform": platform.platform(), "metrics": {}, "skipped": {},
+               "window": "tk" if drawOnDisplay else "recording"}
+    for name, function, needsDisplay in benchmarks:
+        try:
+            metrics = function()
+        except Exception as error:
+            if not needsDisplay:
+                raise
+            results["skipped"][name] = "{}: {}".format(type(error).__name__, error)
+            print("{:40} skipped ({})".format(name, results["skipped"][name]))
+            continue
+        for metric, seconds in metrics.items():
+            key = "{}[{}]".format(name, metric)
+            results["metrics"][key] = seconds
+            print("{:40} {:12.2f} us".format(key, seconds * 1e6))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Prints how each metric changed against the baseline, returns the metrics that got slower than tolerance and
+    the metrics the baseline doesn't have."""
+    regressions = []
+    missing = []
+    for key, seconds in sorted(results["metrics"].items()):
+        if key not in baseline.get("metrics", {}):
+            missing.append(key)
+            print("{:40} ERROR: no baseline".format(key))
+            continue
+        change = seconds / baseline["metrics"][key] - 1
+        marker = ""
+        if change > tolerance:
+            regressions.append(key)
+            marker = "  REGRESSION"
+        print("{:40} {:+7.1%}{}".format(key, change, marker))
+    return regressions, missing
+
+
+def main():
+    """Runs the suite, saves and compares the results, exits with an error if anything regressed or has no
+    baseline."""
+    parser = argparse.ArgumentParser(description="Running Sim 2k19 benchmarks")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=defaultBaseline, help="JSON results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=.4, help="allowed slowdown before failing (.4 = 40%%)")
+    parser.add_argument("--runs", type=int, default=1, help="run the suite this many times, keeping each median")
+    parser.add_argument("--display", action="store_true", help="draw into a real Tk window instead of a recording")
+    arguments = parser.parse_args()
+
+    global drawOnDisplay
+    drawOnDisplay = arguments.display
+
+    runs = [runAll() for i in range(arguments.runs)]
+    results = runs[0]
+    results["metrics"] = {key: statistics.median(run["metrics"][key] for run in runs) for key in results["metrics"]}
+
+    if arguments.save:
+        with open(arguments.save, "w") as resultsFile:
+            json.dump(results, resultsFile, indent=2, sort_keys=True)
+
+    if arguments.update_baseline:
+        with open(arguments.baseline, "w") as baselineFile:
+            json.dump(results, baselineFile, indent=2, sort_keys=True)
+        print("Baseline written to {}".format(arguments.baseline))
+        return
+
+    if os.path.exists(arguments.baseline):
+        with open(arguments.baseline) as baselineFile:
+            baseline = json.load(baselineFile)
+
+        # Drawing times in a real window and in a recording window can't be compared
+        if baseline.get("window", "recording") != results["window"]:
+            print("\nThe baseline drew into a {} window, this run drew into a {} window".format(
+                baseline.get("window", "recording"), results["window"]))
+            sys.exit(2)
+        print("\nCompared with {}".format(arguments.baseline))
+        regressions, missing = compare(results, baseline, arguments.tolerance)
+        if regressions:
+            print("\n{} metric(s) regressed by more than {:.0%}".format(len(regressions), arguments.tolerance))
+        if missing:
+            print("\n{} metric(s) have no baseline, add them with --update-baseline".format(len(missing)))
+        if regressions or missing:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
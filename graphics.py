@@ -149,6 +149,7 @@ __version__ = "5.0"
 #     Added Entry boxes.
 
 import time, os, sys, math
+from collections import OrderedDict
 
 try:  # import as appropriate for 2.x vs. 3.x
     import tkinter as tk
@@ -185,24 +186,107 @@ BAD_OPTION = "Illegal option value"
 ##########################################################################
 # global variables and funtions
 
-_root = tk.Tk()
-_root.withdraw()
+# The Tk root is only created once something needs it (see _getRoot), so
+# importing this module is cheap and works without a display.
+_root = None
 
-_update_lasttime = time.time()
+
+def _getRoot():
+    """Returns the shared hidden Tk root, creating it on first use"""
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+        # MacOS fix 1
+        _root.update()
+    return _root
+
+
+_update_lasttime = time.monotonic()
 
 
 def update(rate=None):
     global _update_lasttime
     if rate:
-        now = time.time()
-        pauseLength = 1 / rate - (now - _update_lasttime)
-        if pauseLength > 0:
-            time.sleep(pauseLength)
-            _update_lasttime = now + pauseLength
+        # Sleep until the next frame is due, measured from when the last frame was due
+        # so that oversleeping doesn't slowly drift the rate
+        deadline = _update_lasttime + 1 / rate
+        now = time.monotonic()
+        if deadline > now:
+            time.sleep(deadline - now)
+            _update_lasttime = deadline
         else:
             _update_lasttime = now
 
-    _root.update()
+    _getRoot().update()
+
+
+class TransformCache:
+    """Bounded LRU cache of transformed PhotoImages shared by every Image.
+    Keys are (source, scale, angle) so each distinct sprite is only resized
+    and rotated once per process."""
+
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached PhotoImage for key or None"""
+        img = self.entries.get(key)
+        if img is None:
+            self.misses = self.misses + 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits = self.hits + 1
+        return img
+
+    def peek(self, key):
+        """Return the cached PhotoImage for key or None, without
+        counting a hit or miss or refreshing its place in the LRU order"""
+        return self.entries.get(key)
+
+    def put(self, key, img):
+        """Store img under key, evicting the least recently used entry if full"""
+        self.entries[key] = img
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+            self.evictions = self.evictions + 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """Return a dictionary of the hit/miss/eviction counters"""
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "size": len(self.entries)}
+
+
+transformCache = TransformCache()
+
+# Original PIL images decoded ahead of time (e.g. by a background loader),
+# keyed by file name. Image objects use these instead of reading the file.
+loadedImages = {}
+
+
+def transformPILImage(pilImage, scale=1, angle=0):
+    """Returns a resized and/or rotated copy of a PIL image. Touches no Tk
+    state, so it is safe to call from a worker thread"""
+    newWidth = int(pilImage.width * scale)
+    newHeight = int(pilImage.height * scale)
+    tempImg = pilImage.resize((newWidth, newHeight), resample=PILIMage.BILINEAR)
+    return tempImg.rotate(angle, resample=PILIMage.BILINEAR, expand=True)
+
+
+def cacheFileImage(path, pilImage, scale=1, angle=0):
+    """Stores pilImage (file path already transformed by scale/angle) in
+    transformCache as a PhotoImage. Must be called on the Tk thread"""
+    img = PILImageTK.PhotoImage(pilImage, master=_getRoot())
+    transformCache.put((("file", path), scale, angle), img)
+    return img
 
 
 ############################################################################
@@ -214,7 +298,7 @@ class GraphWin(tk.Canvas):
     def __init__(self, title="Graphics Window",
                  width=200, height=200, autoflush=True):
         assert type(title) == type(""), "Title must be a string"
-        master = tk.Toplevel(_root)
+        master = tk.Toplevel(_getRoot())
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height,
                            highlightthickness=0, bd=0)
@@ -222,7 +306,7 @@ class GraphWin(tk.Canvas):
         self.pack()
         master.resizable(0, 0)
         self.foreground = "black"
-        self.items = []
+        self.items = {}  # drawn objects, a dict so add/remove are O(1) and keep draw order
         self.mouseX = None
         self.mouseY = None
         self.keys = set()  # DJC: Added 03.05.18.11.33
@@ -241,7 +325,7 @@ class GraphWin(tk.Canvas):
         self.closed = False
         master.lift()
         self.lastKey = ""
-        if autoflush: _root.update()
+        if autoflush: _getRoot().update()
 
     def __repr__(self):
         if self.isClosed():
@@ -289,7 +373,7 @@ class GraphWin(tk.Canvas):
 
     def __autoflush(self):
         if self.autoflush:
-            _root.update()
+            _getRoot().update()
 
     def plot(self, x, y, color="black"):
         """Set pixel (x,y) to the given color"""
@@ -310,13 +394,14 @@ class GraphWin(tk.Canvas):
         self.__checkOpen()
         self.update_idletasks()
 
-    def getMouse(self):
+    def getMouse(self, idle=None):
         """Wait for mouse click and return Point object representing
-        the click"""
+        the click. idle (optional) is called while waiting"""
         self.update()  # flush any prior clicks
         self.mouseX = None
         self.mouseY = None
         while self.mouseX == None or self.mouseY == None:
+            if idle: idle()
             self.update()
             if self.isClosed(): raise GraphicsError("getMouse in closed window")
             time.sleep(.1)  # give up thread
@@ -339,10 +424,12 @@ class GraphWin(tk.Canvas):
         else:
             return None
 
-    def getKey(self):
-        """Wait for user to press a key and return it as a string."""
+    def getKey(self, idle=None):
+        """Wait for user to press a key and return it as a string.
+        idle (optional) is called while waiting"""
         self.lastKey = ""
         while self.lastKey == "":
+            if idle: idle()
             self.update()
             if self.isClosed(): raise GraphicsError("getKey in closed window")
             time.sleep(.1)  # give up thread
@@ -393,13 +480,13 @@ class GraphWin(tk.Canvas):
             self._mouseCallback(Point(e.x, e.y))
 
     def addItem(self, item):
-        self.items.append(item)
+        self.items[item] = None
 
     def delItem(self, item):
-        self.items.remove(item)
+        del self.items[item]
 
     def redraw(self):
-        for item in self.items[:]:
+        for item in list(self.items):
             item.undraw()
             item.draw(self)
         self.update()
@@ -486,6 +573,9 @@ class GraphicsObject:
         self.canvas = None
         self.id = None
 
+        # group is the Group the object moves with, if any
+        self.group = None
+
         # config is the dictionary of configuration options for the widget.
         config = {}
         for option in options:
@@ -518,6 +608,7 @@ class GraphicsObject:
         if not self.canvas.isClosed():
             self.canvas.delete(self.id)
         self.id = self._draw(self.canvas, self.config)
+        self._tagGroup()
 
     def draw(self, graphwin):
 
@@ -530,9 +621,10 @@ class GraphicsObject:
         if graphwin.isClosed(): raise GraphicsError("Can't draw to closed window")
         self.canvas = graphwin
         self.id = self._draw(graphwin, self.config)
+        self._tagGroup()
         graphwin.addItem(self)
         if graphwin.autoflush:
-            _root.update()
+            _getRoot().update()
         return self
 
     def undraw(self):
@@ -545,7 +637,7 @@ class GraphicsObject:
             self.canvas.delete(self.id)
             self.canvas.delItem(self)
             if self.canvas.autoflush:
-                _root.update()
+                _getRoot().update()
         self.canvas = None
         self.id = None
 
@@ -566,7 +658,23 @@ class GraphicsObject:
                 y = dy
             self.canvas.move(self.id, x, y)
             if canvas.autoflush:
-                _root.update()
+                _getRoot().update()
+
+    def lift(self):
+
+        """Raise the object above every other item in its window"""
+
+        canvas = self.canvas
+        if canvas and not canvas.isClosed():
+            canvas.tag_raise(self.id)
+            if canvas.autoflush:
+                _getRoot().update()
+
+    def _tagGroup(self):
+        # Internal method that gives a freshly drawn canvas item the tag
+        #    of the object's group so moving the group moves it too
+        if self.group is not None:
+            self.canvas.addtag_withtag(self.group.tag, self.id)
 
     def _reconfig(self, option, setting):
         # Internal method for changing configuration of the object
@@ -575,11 +683,13 @@ class GraphicsObject:
         if option not in self.config:
             raise GraphicsError(UNSUPPORTED_METHOD)
         options = self.config
+        if options[option] == setting:
+            return  # nothing changed, skip the round trip to Tk
         options[option] = setting
         if self.canvas and not self.canvas.isClosed():
             self.canvas.itemconfig(self.id, options)
             if self.canvas.autoflush:
-                _root.update()
+                _getRoot().update()
 
     def _draw(self, canvas, options):
         """draws appropriate figure on canvas with options provided
@@ -590,14 +700,121 @@ class GraphicsObject:
         """updates internal state of object to move it dx,dy units"""
         pass  # must override in subclass
 
+    def _setAnchor(self, x, y):
+        # Internal method for objects with an anchor point. Moves the
+        #    anchor to (x,y) and repositions the existing canvas item
+        #    instead of deleting and recreating it.
+        anchor = self.anchor
+        if anchor.x == x and anchor.y == y:
+            return
+        anchor.x = float(x)
+        anchor.y = float(y)
+        canvas = self.canvas
+        if canvas and not canvas.isClosed():
+            canvas.coords(self.id, *canvas.toScreen(anchor.x, anchor.y))
+            if canvas.autoflush:
+                _getRoot().update()
+
+
+class Group:
+    """A named set of objects backed by a Tk canvas tag, so the whole
+    set is moved or raised with a single Tk call however many objects
+    it holds"""
+
+    def __init__(self, graphwin, tag):
+        self.canvas = graphwin
+        self.tag = tag
+        self.members = set()
+
+    def __repr__(self):
+        return "Group({}, {} members)".format(self.tag, len(self.members))
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, item):
+        """Adds a GraphicsObject to the group, drawn or not"""
+        if item.group is self:
+            return
+        if item.group is not None:
+            item.group.remove(item)
+        item.group = self
+        self.members.add(item)
+        if item.canvas is self.canvas and not self.canvas.isClosed():
+            self.canvas.addtag_withtag(self.tag, item.id)
+
+    def remove(self, item):
+        """Takes a GraphicsObject out of the group, it stays drawn"""
+        if item.group is not self:
+            return
+        item.group = None
+        self.members.discard(item)
+        if item.canvas is self.canvas and not self.canvas.isClosed():
+            self.canvas.dtag(item.id, self.tag)
+
+    def move(self, dx, dy):
+        """Moves every object in the group dx units in x direction and
+        dy units in y direction with one Tk call"""
+        for item in self.members:
+            item._move(dx, dy)
+        canvas = self.canvas
+        if not canvas.isClosed():
+            trans = canvas.trans
+            if trans:
+                x = dx / trans.xscale
+                y = -dy / trans.yscale
+            else:
+                x = dx
+                y = dy
+            canvas.move(self.tag, x, y)
+            if canvas.autoflush:
+                _getRoot().update()
+
+    def lift(self):
+        """Raises every object in the group above the other items in
+        the window"""
+        canvas = self.canvas
+        if not canvas.isClosed():
+            canvas.tag_raise(self.tag)
+            if canvas.autoflush:
+                _getRoot().update()
+
+
+class Vector:
+    """Lightweight (x, y) pair for pure geometry. Unlike Point it cannot be
+    drawn, so it carries no config dictionary or canvas reference."""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = float(x)
+        self.y = float(y)
+
+    def __repr__(self):
+        return "Vector({}, {})".format(self.x, self.y)
+
+    def move(self, dx, dy):
+        self.x = self.x + dx
+        self.y = self.y + dy
+
+    def clone(self):
+        return Vector(self.x, self.y)
+
+    def getX(self): return self.x
+
+    def getY(self): return self.y
+
 
 class Point(GraphicsObject):
     def __init__(self, x, y):
         GraphicsObject.__init__(self, ["outline", "fill"])
-        self.setFill = self.setOutline
         self.x = float(x)
         self.y = float(y)
 
+    def setFill(self, color):
+        """Points only have one color, same as setOutline"""
+        self.setOutline(color)
+
     def __repr__(self):
         return "Point({}, {})".format(self.x, self.y)
 
@@ -625,8 +842,8 @@ class _BBox(GraphicsObject):
 
     def __init__(self, p1, p2, options=["outline", "width", "fill", "activefill"]):  # BB added activefill
         GraphicsObject.__init__(self, options)
-        self.p1 = p1.clone()
-        self.p2 = p2.clone()
+        self.p1 = Vector(p1.x, p1.y)
+        self.p2 = Vector(p2.x, p2.y)
 
     def _move(self, dx, dy):
         self.p1.x = self.p1.x + dx
@@ -634,9 +851,9 @@ class _BBox(GraphicsObject):
         self.p2.x = self.p2.x + dx
         self.p2.y = self.p2.y + dy
 
-    def getP1(self): return self.p1.clone()
+    def getP1(self): return Point(self.p1.x, self.p1.y)
 
-    def getP2(self): return self.p2.clone()
+    def getP2(self): return Point(self.p2.x, self.p2.y)
 
     def getCenter(self):
         p1 = self.p1
@@ -915,7 +1132,7 @@ class Text(GraphicsObject):
     def __init__(self, p, text):
         GraphicsObject.__init__(self, ["justify", "fill", "text", "font"])
         self.setText(text)
-        self.anchor = p.clone()
+        self.anchor = Vector(p.x, p.y)
         self.setFill(DEFAULT_CONFIG['outline'])
         self.setOutline = self.setFill
 
@@ -942,7 +1159,11 @@ class Text(GraphicsObject):
         return self.config["text"]
 
     def getAnchor(self):
-        return self.anchor.clone()
+        return Point(self.anchor.x, self.anchor.y)
+
+    def setAnchor(self, x, y):
+        """Moves the text so it is centered on (x,y), updating it in place if drawn"""
+        self._setAnchor(x, y)
 
     def setFace(self, face):
         if face in ['helvetica', 'arial', 'courier', 'times roman']:
@@ -972,10 +1193,10 @@ class Text(GraphicsObject):
 class Entry(GraphicsObject):
     def __init__(self, p, width):
         GraphicsObject.__init__(self, [])
-        self.anchor = p.clone()
+        self.anchor = Vector(p.x, p.y)
         # print self.anchor
         self.width = width
-        self.text = tk.StringVar(_root)
+        self.text = tk.StringVar(_getRoot())
         self.text.set("")
         self.fill = "gray"
         self.color = "black"
@@ -1007,7 +1228,7 @@ class Entry(GraphicsObject):
         self.anchor.move(dx, dy)
 
     def getAnchor(self):
-        return self.anchor.clone()
+        return Point(self.anchor.x, self.anchor.y)
 
     def clone(self):
         other = Entry(self.anchor, self.width)
@@ -1062,21 +1283,29 @@ class Image(GraphicsObject):
 
     def __init__(self, p, *pixmap):
         GraphicsObject.__init__(self, [])
-        self.anchor = p.clone()
+        self.anchor = Vector(p.x, p.y)
         self.imageId = Image.idCount
         self.pilImage = None  # DJC: 01.30.19.14.44 Original PIL Image
+        self.source = ("image", self.imageId)  # identifies the original for transformCache
+        self.sharedImg = False  # True while self.img may also be shown by other Images (see setPixel)
         Image.idCount = Image.idCount + 1
         if len(pixmap) == 1:  # file name provided
+            self.source = ("file", pixmap[0])
             # DJC: 01.30.19.14.45 Added PIL Support
             if importedPillow:
-                self.pilImage = PILIMage.open(pixmap[0])  # Save original to reference & prevent image degradation
-                self.img = PILImageTK.PhotoImage(self.pilImage, master=_root)
+                self.pilImage = loadedImages.get(pixmap[0])  # Save original to reference & prevent image degradation
+                if self.pilImage is None:
+                    self.pilImage = PILIMage.open(pixmap[0])
+                self.img = transformCache.peek((self.source, 1, 0))  # preloaded by a background loader
+                self.sharedImg = self.img is not None
+                if self.img is None:
+                    self.img = PILImageTK.PhotoImage(self.pilImage, master=_getRoot())
             else:
-                self.img = tk.PhotoImage(file=pixmap[0], master=_root)
+                self.img = tk.PhotoImage(file=pixmap[0], master=_getRoot())
                 # DJC: End
         else:  # width and height provided
             width, height = pixmap
-            self.img = tk.PhotoImage(master=_root, width=width, height=height)
+            self.img = tk.PhotoImage(master=_getRoot(), width=width, height=height)
 
     def __repr__(self):
         return "Image({}, {}, {})".format(self.anchor, self.getWidth(), self.getHeight())
@@ -1098,10 +1327,28 @@ class Image(GraphicsObject):
         GraphicsObject.undraw(self)
 
     def getAnchor(self):
-        return self.anchor.clone()
+        return Point(self.anchor.x, self.anchor.y)
+
+    def setAnchor(self, x, y):
+        """Moves the image so it is centered on (x,y), updating it in place if drawn"""
+        self._setAnchor(x, y)
+
+    def setImage(self, img):
+        """Shows a different Tk PhotoImage, updating it in place if drawn.
+        img may be shared with other Images, setPixel copies it first"""
+        if img is self.img:
+            return
+        self.img = img
+        self.sharedImg = True
+        canvas = self.canvas
+        if canvas and not canvas.isClosed():
+            self.imageCache[self.imageId] = img  # save a reference
+            canvas.itemconfig(self.id, image=img)
+            if canvas.autoflush:
+                _getRoot().update()
 
     def clone(self):
-        other = Image(Point(0, 0), 0, 0)
+        other = Image(Vector(0, 0), 0, 0)
         other.img = self.img.copy()
         other.anchor = self.anchor.clone()
         other.config = self.config.copy()
@@ -1129,8 +1376,13 @@ class Image(GraphicsObject):
             return list(map(int, value.split()))
 
     def setPixel(self, x, y, color):
-        """Sets pixel (x,y) to the given color
+        """Sets pixel (x,y) to the given color. A PhotoImage shared
+        through transformCache or setImage is copied first, so other
+        Images showing it don't change
         """
+        if self.sharedImg:
+            self.setImage(self.img.copy())
+            self.sharedImg = False
         self.img.put("{" + color + "}", (x, y))
 
     def save(self, filename):
@@ -1144,14 +1396,17 @@ class Image(GraphicsObject):
 
     # DJC: Added 01.30.19.19.49
     def transform(self, scale=1, angle=0):
-        """Resizes and/or Rotates the 'original' image according to the scale/angle passed."""
+        """Resizes and/or Rotates the 'original' image according to the scale/angle passed.
+        Results are shared through transformCache, so repeated calls are cheap."""
         if importedPillow:
-            tempImg = self.pilImage.copy()
-            newWidth = int(tempImg.width * scale)
-            newHeight = int(tempImg.height * scale)
-            tempImg = tempImg.resize((newWidth, newHeight), resample=PILIMage.BILINEAR)
-            tempImg = tempImg.rotate(angle, resample=PILIMage.BILINEAR, expand=True)
-            self.img = PILImageTK.PhotoImage(tempImg, master=_root)
+            key = (self.source, scale, angle)
+            img = transformCache.get(key)
+            if img is None:
+                tempImg = transformPILImage(self.pilImage, scale, angle)
+                img = PILImageTK.PhotoImage(tempImg, master=_getRoot())
+                transformCache.put(key, img)
+            self.img = img
+            self.sharedImg = True
         else:
             raise Exception("You need to install the Pillow module to resize/rotate images."
                             "\n           For instructions, see: https://pillow.readthedocs.io/en/3.3.x/installation.html")
@@ -1212,8 +1467,5 @@ def test():
 # MacOS fix 2
 # tk.Toplevel(_root).destroy()
 
-# MacOS fix 1
-update()
-
 if __name__ == "__main__":
     test()
\ No newline at end of file
@@ -0,0 +1,156 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Assets
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Loads the images and sounds of the game in a thread pool. Worker threads only read the asset pack or
+#              decode PNG and WAV files (and scale them with Pillow), everything that touches Tk is done in poll() on
+#              the Tk thread, which hands the finished images to graphics so Image objects and transform() find them
+#              already loaded.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import time
+from concurrent.futures import ThreadPoolExecutor
+import graphics
+from running_sim_audio import audioBackend
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+
+# Worker threads used to decode files (Pillow and zlib let go of the GIL while decoding)
+loaderThreads = 4
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def decodeImage(path, transforms):
+    """Reads a PNG and makes each (scale, angle) version of it, returns (original, [(scale, angle, image), ...]).
+    Runs on a worker thread."""
+    original = graphics.PILIMage.open(path)
+    original.load()
+    images = []
+    for scale, angle in transforms:
+        if scale == 1 and angle == 0:
+            images.append((scale, angle, original))
+        else:
+            images.append((scale, angle, graphics.transformPILImage(original, scale, angle)))
+    return original, images
+
+
+def loadImage(pack, path, transforms):
+    """Returns the images for path from the asset pack, or decodes the PNG if the pack is missing or out of date.
+    Runs on a worker thread."""
+    if pack is not None:
+        images = pack.images(path, transforms)
+        if images is not None:
+            return images
+    return decodeImage(path, transforms)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class AssetLoader:
+    """Decodes images and sounds in the background and hands them to the game on the Tk thread."""
+    def __init__(self, pack=None, backend=None, threads=loaderThreads):
+        """Constructs an asset loader object, pack is an AssetPack to load images from and backend is the audio
+        backend that decodes sounds (both optional). Request everything needed then call start()."""
+        self.pack = pack
+        self.backend = backend if backend is not None else audioBackend()
+        self.threads = threads
+        self.pool = None
+
+        # Requested images as {path: [(scale, angle), ...]} and sounds in the order they were asked for
+        self.images = {}
+        self.soundPaths = []
+
+        # Futures that haven't been handed to the game yet, and everything that has
+        self.pending = []
+        self.sounds = {}
+        self.total = 0
+        self.done = 0
+
+    def requestImage(self, path, scale=1, angle=0):
+        """Asks for an image file at a scale and angle. Without Pillow images are left to load normally."""
+        if not graphics.importedPillow:
+            return
+        transforms = self.images.setdefault(path, [])
+        if (scale, angle) not in transforms:
+            transforms.append((scale, angle))
+
+    def requestSound(self, path):
+        """Asks for a sound file."""
+        if path not in self.soundPaths:
+            self.soundPaths.append(path)
+
+    def start(self):
+        """Starts decoding everything requested, sounds first since they are the largest files."""
+        self.pool = ThreadPoolExecutor(self.threads)
+        for path in self.soundPaths:
+            self.pending.append(("sound", path, self.pool.submit(self.backend.load, path)))
+        for path, transforms in self.images.items():
+            self.pending.append(("image", path, self.pool.submit(loadImage, self.pack, path, transforms)))
+        self.total = len(self.pending)
+        self.pool.shutdown(wait=False)
+
+    def poll(self, budget=.02):
+        """Hands finished files to the game, call on the Tk thread. Stops after budget seconds so the screen stays
+        responsive, returns True once everything is loaded."""
+        deadline = time.perf_counter() + budget
+        i = 0
+        while i < len(self.pending) and time.perf_counter() < deadline:
+            kind, path, future = self.pending[i]
+            if not future.done():
+                i += 1
+                continue
+            del self.pending[i]
+
+            # Raises here if the file couldn't be read
+            if kind == "sound":
+                self.sounds[path] = future.result()
+            else:
+                self.handImages(path, future.result())
+            self.done += 1
+        return self.isDone()
+
+    def handImages(self, path, images):
+        """Gives the loaded versions of an image file to graphics, on the Tk thread."""
+        original, images = images
+        graphics.loadedImages[path] = original
+        for scale, angle, image in images:
+            graphics.cacheFileImage(path, image, scale, angle)
+
+    def loadNow(self, path, scale=1, angle=0):
+        """Loads an image straight away on this thread, for the few that are needed before anything else."""
+        if graphics.importedPillow:
+            self.handImages(path, loadImage(self.pack, path, [(scale, angle)]))
+
+    def isDone(self):
+        """Returns True once every requested file has been handed to the game."""
+        return not self.pending
+
+    def progress(self):
+        """Returns how much has been loaded from 0 to 1."""
+        if not self.total:
+            return 1
+        return self.done / self.total
+
+    def isLoaded(self, path):
+        """Returns True if a requested sound is ready."""
+        return path in self.sounds
+
+    def wait(self):
+        """Blocks until everything is loaded, handing files over as they finish."""
+        while not self.poll():
+            time.sleep(.005)
+
+    def sound(self, path):
+        """Returns a sound, waiting for it if it is still loading or reading it now if it was never requested."""
+        while path not in self.sounds and any(pendingPath == path for kind, pendingPath, future in self.pending):
+            self.poll()
+            time.sleep(.005)
+        if path not in self.sounds:
+            self.sounds[path] = self.backend.load(path)
+        return self.sounds[path]
@@ -0,0 +1,221 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Audio
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Plays the music and sound effects of the game off the game loop. Sound effects are put on a queue and
+#              started by an audio thread that keeps a fixed number of voices, drops effects that are still cooling
+#              down or have too many voices playing, and never makes the game loop wait. Music loops on its own
+#              thread. Without simpleaudio (or with RUNNING_SIM_AUDIO=null) a silent backend keeps the same timing.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import os
+import queue
+import threading
+import time
+import wave
+
+try:  # simpleaudio is only needed to actually hear anything
+    import simpleaudio as sa
+    importedSimpleaudio = True
+except ImportError:
+    importedSimpleaudio = False
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+
+# Voices shared by every sound effect
+voiceCount = 8
+
+# How often the music thread checks if the music has ended, simpleaudio can't queue a buffer behind the one playing
+# so this is the longest gap between loops
+musicCheckInterval = .005
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Backends
+
+
+class SimpleAudioBackend:
+    """Plays sounds through simpleaudio."""
+    name = "simpleaudio"
+
+    def load(self, path):
+        """Returns a sound decoded into memory, safe to call from any thread."""
+        return sa.WaveObject.from_wave_file(path)
+
+    def play(self, sound):
+        """Starts a sound, returns a voice with is_playing() and stop()."""
+        return sound.play()
+
+    def stopAll(self):
+        """Stops every sound."""
+        sa.stop_all()
+
+
+class NullSound:
+    """A sound that is never heard but lasts as long as its file."""
+    def __init__(self, duration):
+        """Constructs a null sound object."""
+        self.duration = duration
+
+
+class NullVoice:
+    """A silent voice that plays for the length of its sound."""
+    def __init__(self, sound):
+        """Constructs a null voice object, starting it straight away."""
+        self.end = time.monotonic() + sound.duration
+        self.stopped = False
+
+    def is_playing(self):
+        """Returns True until the sound would have ended or the voice is stopped."""
+        return not self.stopped and time.monotonic() < self.end
+
+    def stop(self):
+        """Stops the voice."""
+        self.stopped = True
+
+
+class NullBackend:
+    """Plays nothing, for headless runs and machines without simpleaudio."""
+    name = "null"
+
+    def load(self, path):
+        """Returns a silent sound as long as the WAV file at path."""
+        with wave.open(path, "rb") as waveFile:
+            return NullSound(waveFile.getnframes() / waveFile.getframerate())
+
+    def play(self, sound):
+        """Starts a silent voice."""
+        return NullVoice(sound)
+
+    def stopAll(self):
+        """Nothing to stop, null voices end on their own."""
+
+
+def audioBackend():
+    """Returns the simpleaudio backend, or the null backend if simpleaudio is missing or RUNNING_SIM_AUDIO=null."""
+    if importedSimpleaudio and os.environ.get("RUNNING_SIM_AUDIO") != "null":
+        return SimpleAudioBackend()
+    return NullBackend()
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class SoundEffect:
+    """A preloaded sound effect and the limits on how often it plays."""
+    def __init__(self, sound, cooldown=0, maxVoices=voiceCount):
+        """Constructs a sound effect object, cooldown is the least seconds between two plays."""
+        self.sound = sound
+        self.cooldown = cooldown
+        self.maxVoices = maxVoices
+        self.lastPlayed = None
+
+
+class Mixer:
+    """Plays music and sound effects on audio threads so the game loop never waits for them."""
+    def __init__(self, backend=None, voices=voiceCount):
+        """Constructs a mixer object and starts its sound effect thread."""
+        self.backend = backend if backend is not None else audioBackend()
+        self.effects = {}
+
+        # Fixed pool of voices as (effect name, voice), None when free
+        self.voices = [None] * voices
+        self.played = 0
+        self.dropped = 0
+
+        # Sound effects waiting to be started, None stops the thread
+        self.queue = queue.SimpleQueue()
+        self.effectThread = threading.Thread(target=self.runEffects, name="sound effects", daemon=True)
+        self.effectThread.start()
+
+        # The music playing, replaced each time music is started so an old loop knows to stop
+        self.musicLock = threading.Lock()
+        self.music = None
+        self.musicVoice = None
+
+    def addSound(self, name, sound, cooldown=0, maxVoices=voiceCount):
+        """Adds a preloaded sound effect that can be played by name."""
+        self.effects[name] = SoundEffect(sound, cooldown, maxVoices)
+
+    def play(self, name):
+        """Asks for a sound effect to be played, returns straight away. Raises KeyError here, on the caller's thread,
+        if no sound effect was added under name, since the sound effect thread would stop on it."""
+        if name not in self.effects:
+            raise KeyError("no sound effect named {!r}".format(name))
+        self.queue.put(name)
+
+    def runEffects(self):
+        """Starts queued sound effects, runs on the sound effect thread."""
+        while True:
+            name = self.queue.get()
+            if name is None:
+                return
+            effect = self.effects[name]
+
+            # Drop the effect if it played too recently
+            now = time.monotonic()
+            if effect.lastPlayed is not None and now - effect.lastPlayed < effect.cooldown:
+                self.dropped += 1
+                continue
+
+            # Free the voices that have finished, counting the ones still playing this effect
+            free = None
+            playing = 0
+            for i in range(len(self.voices)):
+                voice = self.voices[i]
+                if voice is not None and not voice[1].is_playing():
+                    voice = self.voices[i] = None
+                if voice is None:
+                    if free is None:
+                        free = i
+                elif voice[0] == name:
+                    playing += 1
+
+            # Drop the effect instead of stacking up voices
+            if free is None or playing >= effect.maxVoices:
+                self.dropped += 1
+                continue
+
+            self.voices[free] = (name, self.backend.play(effect.sound))
+            effect.lastPlayed = now
+            self.played += 1
+
+    def playMusic(self, sound, loop=True):
+        """Plays music in place of any music already playing, looping it until it is stopped."""
+        with self.musicLock:
+            self.stopMusicLocked()
+            music = self.music = object()
+        threading.Thread(target=self.runMusic, args=(sound, loop, music), name="music", daemon=True).start()
+
+    def runMusic(self, sound, loop, music):
+        """Plays music again as soon as it ends, runs on its own thread."""
+        while True:
+            with self.musicLock:
+                if self.music is not music:
+                    return
+                voice = self.musicVoice = self.backend.play(sound)
+            while voice.is_playing():
+                time.sleep(musicCheckInterval)
+            if not loop:
+                return
+
+    def stopMusic(self):
+        """Stops the music."""
+        with self.musicLock:
+            self.stopMusicLocked()
+
+    def stopMusicLocked(self):
+        """Stops the music, the caller holds the music lock."""
+        self.music = None
+        if self.musicVoice is not None:
+            self.musicVoice.stop()
+            self.musicVoice = None
+
+    def close(self):
+        """Stops every sound and the sound effect thread."""
+        self.stopMusic()
+        self.queue.put(None)
+        self.effectThread.join()
+        self.backend.stopAll()
@@ -0,0 +1,82 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Collision
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Collision checks between characters and obstacles for the running sim 2k19 engine. Obstacles all
+#              spawn at the same x and scroll at the same speed, so the obstacle field is always sorted by x and a
+#              binary search finds the few obstacles near a character.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+from bisect import bisect_left, bisect_right
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class AABB:
+    """Axis aligned bounding box that is updated in place instead of being rebuilt every frame."""
+    __slots__ = ("left", "top", "right", "bottom")
+
+    def __init__(self, left=0.0, top=0.0, right=0.0, bottom=0.0):
+        """Constructs an AABB object."""
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def set(self, left, top, right, bottom):
+        """Moves the box to new edges."""
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def overlaps(self, other):
+        """Returns True if the boxes overlap (touching counts as a hit)."""
+        return self.right >= other.left and self.left <= other.right and \
+            self.bottom >= other.top and self.top <= other.bottom
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def updateBounds(character):
+    """Updates the box a character collides with, which is shorter while crouching, and returns it."""
+    if not character.crouched:
+        halfHeight = 11 * character.size
+    else:
+        halfHeight = 5 * character.size
+    halfWidth = 8 * character.size
+    bounds = character.bounds
+    bounds.set(character.x - halfWidth, character.y - halfHeight, character.x + halfWidth, character.y + halfHeight)
+    return bounds
+
+
+def findCollisions(characters, obstacles, hit, box):
+    """Fills hit with every character whose box overlaps the hitbox of an obstacle in an ObstacleField.
+    hit is cleared first and reused, and box (an AABB) is filled with each obstacle's hitbox in turn, so checking
+    collisions allocates nothing."""
+    hit.clear()
+    if not len(obstacles):
+        return hit
+
+    baseX = obstacles.baseX
+    scroll = obstacles.scroll
+    reach = obstacles.reach
+    for character in characters:
+        bounds = updateBounds(character)
+
+        # Broad phase, only obstacles whose x is close enough for their hitbox to reach the character
+        first = bisect_left(baseX, bounds.left - reach + scroll)
+        last = bisect_right(baseX, bounds.right + reach + scroll)
+
+        # Narrow phase, the boxes overlap (touching counts as a hit)
+        i = first
+        while i < last:
+            if bounds.overlaps(obstacles.hitBox(i, box)):
+                hit.append(character)
+                break
+            i += 1
+    return hit
@@ -0,0 +1,625 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Engine
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Headless simulation core for the running sim 2k19 game. Nothing in here may import Tk, PIL or
+#              simpleaudio so the game logic can be stepped without a display.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import heapq
+import random
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from running_sim_collision import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+
+# The game simulates one tick every 4 centiseconds (25 ticks per second), every speed is in pixels per second and is
+# integrated over the length of a tick so the game plays the same however often frames are drawn
+tickCentiseconds = 4
+ticksPerSecond = 100 // tickCentiseconds
+tickSeconds = tickCentiseconds / 100
+
+backgroundSpeed = 50
+
+# Idle characters drift left a little slower than the background scrolls
+idleDrift = 12.5
+idleCharacterSpeed = backgroundSpeed - idleDrift
+
+# How fast characters run, and how much faster they move forwards while jumping
+runSpeed = 175
+jumpBoost = 75
+
+# Size of the play area and the height of the ground the characters run on
+worldWidth = 1024
+worldHeight = 512
+groundHeight = 431
+
+# Where new obstacles appear
+spawnX = 1200
+
+# Centiseconds between obstacles at the Easy, Moderate and Hard difficulties, and the seconds survived to reach
+# Moderate and Hard
+difficultyNames = ("Easy", "Moderate", "Hard")
+difficultyTimers = (1500, 1000, 700)
+difficultySeconds = (30, 90)
+
+# How likely each obstacle is (in the order of obstacleKinds) at each difficulty, and how many spawns are planned ahead
+spawnWeights = ((3, 3, 2, 2, 0),
+                (2, 2, 2, 2, 1),
+                (2, 2, 2, 2, 2))
+spawnLookAhead = 3
+
+# Most ticks the game loop will run to catch up before it drops the missed time
+maxCatchUpSteps = 5
+
+# Character states (indexes into characterStates) and the directions a character can face
+standingIdle, running, crouching, crouchingIdle, jumping = range(5)
+facingLeft, facingRight = range(2)
+directionNames = ("left", "right")
+
+# How high a jump goes and how long it lasts, the take off speed and gravity are worked out from them
+jumpHeight = 88
+jumpSeconds = .56
+jumpSpeed = 4 * jumpHeight / jumpSeconds
+gravity = 8 * jumpHeight / jumpSeconds ** 2
+
+# Seconds each frame of a running or crouching animation is shown
+animationFrameSeconds = .04
+
+# Actions a key can be bound to, each is one bit of a player's input mask (in the order of a character's controls)
+actions = ("up", "left", "down", "right")
+upBit = 1
+leftBit = 2
+downBit = 4
+rightBit = 8
+
+# Key bindings for each player in the order of actions, the number of rows is the most players a game can have
+playerControls = (("w", "a", "s", "d"),
+                  ("8", "4", "5", "6"),
+                  ("Up", "Left", "Down", "Right"),
+                  ("i", "j", "k", "l"),
+                  ("t", "f", "g", "h"),
+                  ("Home", "Delete", "End", "Next"),
+                  ("p", "o", "semicolon", "bracketleft"),
+                  ("2", "1", "q", "3"))
+maxPlayers = len(playerControls)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class Character:
+    """Simulation state for a single character."""
+    def __init__(self, x, y, name, speed, controls, size=1, rotation=0):
+        """Constructs a character object."""
+        self.x = x
+        self.y = y
+        self.name = name
+        self.trueIdentity = name
+        self.speed = speed
+        self.size = size
+        self.rotation = rotation
+        self.imageCycle = 0
+        self.animationTime = 0.0
+        self.direction = facingRight
+        self.state = standingIdle
+        self.crouched = False
+
+        # Vertical speed (negative is up) and the y the character lands back on after a jump
+        self.ySpeed = 0.0
+        self.floorY = y
+        self.controls = controls
+        self.mistakes = 0
+        self.idleSpeed = idleCharacterSpeed
+
+        # The box used for collisions, updated in place by the collision checks
+        self.bounds = AABB()
+
+    def setState(self, state, direction):
+        """Switches the character to a state (see characterStates) and direction, starting its animation over if
+        either changed."""
+        if state != self.state or direction != self.direction:
+            self.state = state
+            self.direction = direction
+            self.imageCycle = 0
+            self.animationTime = 0.0
+            self.crouched = characterStates[state].crouched
+
+    def advanceAnimation(self, dt=tickSeconds):
+        """Advances the animation iterator for the current state by dt seconds, moving on to the next state after the
+        last frame."""
+        self.animationTime += dt
+        characterState = characterStates[self.state]
+        while self.animationTime >= characterState.frameSeconds:
+            self.animationTime -= characterState.frameSeconds
+            if self.imageCycle < characterState.frameCount - 1:
+                self.imageCycle += 1
+            elif characterState.nextState != self.state:
+                self.setState(characterState.nextState, self.direction)
+                characterState = characterStates[self.state]
+            else:
+                self.imageCycle = 0
+
+    def move(self, inputs, dt=tickSeconds):
+        """Updates the state, direction and coordinates of the character over dt seconds based on its input mask (see
+        actions)."""
+
+        # Not hardcoded key values because different characters have different controls, GameState.resolveInput()
+        # turns the keys pressed into the actions of each character
+        # Tests actions being pressed
+
+        # Crouching
+        if inputs & downBit and self.state != jumping:
+
+            # Running right while crouching
+            if inputs & rightBit:
+                self.setState(crouching, facingRight)
+                self.x += self.speed * dt
+
+            # Running left while crouching
+            elif inputs & leftBit:
+                self.setState(crouching, facingLeft)
+                self.x -= self.speed * dt
+
+            # Crouching idle
+            else:
+                self.setState(crouchingIdle, self.direction)
+                self.x -= self.idleSpeed * dt
+
+        # Jumping, taking off from the ground
+        elif inputs & upBit or self.state == jumping:
+            if self.state != jumping:
+                self.ySpeed = -jumpSpeed
+                self.setState(jumping, self.direction)
+
+            # Exact for constant gravity, so the arc is the same whatever the length of a tick
+            self.y += self.ySpeed * dt + gravity * dt * dt / 2
+            self.ySpeed += gravity * dt
+
+            # Land once back on the ground (within rounding)
+            if self.ySpeed > 0 and self.y >= self.floorY - 1e-6:
+                self.y = self.floorY
+                self.ySpeed = 0.0
+                self.setState(standingIdle, self.direction)
+
+            # Jumping to the right, turning doesn't start the jump over
+            if inputs & rightBit:
+                self.direction = facingRight
+                self.x += (self.speed + jumpBoost) * dt
+
+            # Jumping to the left
+            elif inputs & leftBit:
+                self.direction = facingLeft
+                self.x -= (self.speed + jumpBoost) * dt
+
+        # Running to the right
+        elif inputs & rightBit:
+            self.setState(running, facingRight)
+            self.x += self.speed * dt
+
+        # Running to the left
+        elif inputs & leftBit:
+            self.setState(running, facingLeft)
+            self.x -= self.speed * dt
+
+        # Idle
+        else:
+            self.setState(standingIdle, self.direction)
+            self.x -= self.idleSpeed * dt
+
+    def checkBorders(self, width=worldWidth):
+        """Keeps characters on the screen."""
+
+        # Left border
+        if self.x - (8 * self.size) < 0:
+            self.x = 8 * self.size
+
+        # Right border
+        if self.x + (8 * self.size) > width:
+            self.x = width - (8 * self.size)
+
+        # Top border
+        if self.y - (12 * self.size) < 0:
+            self.y = 12 * self.size
+
+        # Bottom border
+        if self.y + (8 * self.size) > groundHeight:
+            self.y = groundHeight - (12 * self.size)
+
+
+class CharacterState:
+    """One state of a character: how many frames its animation has and how many seconds each is shown, the state it
+    moves on to after the last frame (its own id to loop) and whether the character is crouched in it."""
+    def __init__(self, name, frameCount, nextState, crouched=False, frameSeconds=animationFrameSeconds):
+        """Constructs a character state object."""
+        self.name = name
+        self.frameCount = frameCount
+        self.frameSeconds = frameSeconds
+        self.nextState = nextState
+        self.crouched = crouched
+
+
+class ObstacleKind:
+    """Everything that is the same for every obstacle of one type."""
+    def __init__(self, name, imagePath, y, size, hitBoxExtents):
+        """Constructs an obstacle kind object."""
+        self.name = name
+        self.imagePath = imagePath
+        self.y = y
+        self.size = size
+
+        # Hitbox extents (left, top, right, bottom) before scaling (these numbers are calculated through guess & check)
+        self.hitBoxExtents = hitBoxExtents
+
+
+class ObstacleField:
+    """Every obstacle on the screen, stored as parallel arrays (one entry per obstacle) instead of objects.
+    Positions are kept relative to a shared scroll distance, so scrolling every obstacle is one addition and
+    removing the ones that left the screen is one slice off the front."""
+    def __init__(self):
+        """Constructs an obstacle field object."""
+        self.scroll = 0.0
+        self.nextId = 0
+        self.reach = 0.0
+
+        # The x each obstacle would have if the screen had never scrolled, always sorted because obstacles
+        # spawn at the same x and all scroll together
+        self.baseX = array("d")
+        self.y = array("d")
+        self.size = array("d")
+        self.kind = array("b")
+        self.id = array("q")
+
+        # Scaled hitbox offsets from the obstacle's position
+        self.hitLeft = array("d")
+        self.hitTop = array("d")
+        self.hitRight = array("d")
+        self.hitBottom = array("d")
+
+    def __len__(self):
+        return len(self.baseX)
+
+    def spawn(self, kind, x):
+        """Adds an obstacle of the given kind index at x, returns its id."""
+        obstacleKind = obstacleKinds[kind]
+        size = obstacleKind.size
+        left, top, right, bottom = obstacleKind.hitBoxExtents
+
+        self.baseX.append(x + self.scroll)
+        self.y.append(obstacleKind.y)
+        self.size.append(size)
+        self.kind.append(kind)
+        self.id.append(self.nextId)
+        self.hitLeft.append(left * size)
+        self.hitTop.append(top * size)
+        self.hitRight.append(right * size)
+        self.hitBottom.append(bottom * size)
+
+        self.reach = max(self.reach, left * size, right * size)
+        self.nextId += 1
+        return self.nextId - 1
+
+    def x(self, i):
+        """Returns the current x of the obstacle at index i."""
+        return self.baseX[i] - self.scroll
+
+    def hitBox(self, i, box):
+        """Fills box (an AABB) with the hitbox of the obstacle at index i and returns it."""
+        x = self.baseX[i] - self.scroll
+        y = self.y[i]
+        box.set(x - self.hitLeft[i], y - self.hitTop[i], x + self.hitRight[i], y + self.hitBottom[i])
+        return box
+
+    def advance(self, speed, cullX=-50):
+        """Scrolls every obstacle to the left and removes the ones past cullX."""
+        self.scroll += speed
+
+        # Everything before the first obstacle still on the screen goes in one slice
+        count = bisect_left(self.baseX, cullX + self.scroll)
+        if count:
+            for column in (self.baseX, self.y, self.size, self.kind, self.id,
+                           self.hitLeft, self.hitTop, self.hitRight, self.hitBottom):
+                del column[:count]
+
+
+class SpawnScheduler:
+    """Plans obstacle spawns on simulation ticks. Planned spawns wait in a heap ordered by tick, so each one is made on
+    exactly the tick it was planned for however slowly the frames are drawn."""
+    def __init__(self, rng, timers=difficultyTimers, weights=spawnWeights, lookAhead=spawnLookAhead):
+        """Constructs a spawn scheduler object, rng picks the obstacles, timers are the centiseconds between spawns and
+        weights the chance of each obstacle kind at each difficulty."""
+        self.rng = rng
+        self.timers = timers
+        self.cumulativeWeights = [list(accumulate(levelWeights)) for levelWeights in weights]
+        self.lookAhead = lookAhead
+        self.level = 0
+
+        # Planned spawns as (tick, spawn number, obstacle kind)
+        self.queue = []
+
+        # Random roll of each planned spawn, kept when spawns are planned again so the obstacles don't depend on how
+        # far ahead anyone looked
+        self.rolls = {}
+
+        # Tick of the last spawn made, tick of the last spawn planned and the number of spawns made
+        self.lastTick = 0
+        self.plannedTick = 0
+        self.spawned = 0
+
+        # Obstacle kinds due this tick, reused every tick
+        self.dueKinds = []
+        self.plan(lookAhead)
+
+    def interval(self):
+        """Returns the ticks between spawns at the current difficulty."""
+        return max(1, self.timers[self.level] // tickCentiseconds)
+
+    def pickKind(self, roll):
+        """Returns the obstacle kind a roll from 0 to 1 picks at the current difficulty."""
+        cumulative = self.cumulativeWeights[self.level]
+        return bisect_right(cumulative, roll * cumulative[-1])
+
+    def plan(self, count):
+        """Plans spawns until count of them are waiting."""
+        queue = self.queue
+        while len(queue) < count:
+            number = self.spawned + len(queue)
+            if number not in self.rolls:
+                self.rolls[number] = self.rng.random()
+            self.plannedTick += self.interval()
+            heapq.heappush(queue, (self.plannedTick, number, self.pickKind(self.rolls[number])))
+
+    def setLevel(self, level):
+        """Changes the difficulty, the spawns that haven't been made yet are planned again from the last spawn."""
+        if level == self.level:
+            return
+        self.level = level
+        self.queue.clear()
+        self.plannedTick = self.lastTick
+        self.plan(self.lookAhead)
+
+    def due(self, tick):
+        """Returns the obstacle kinds planned for tick (or earlier) and not made yet. The list is reused by the next
+        call."""
+        queue = self.queue
+        dueKinds = self.dueKinds
+        dueKinds.clear()
+        if not queue or queue[0][0] > tick:
+            return dueKinds
+        while queue and queue[0][0] <= tick:
+            self.lastTick, number, kind = heapq.heappop(queue)
+            del self.rolls[number]
+            dueKinds.append(kind)
+        self.spawned += len(dueKinds)
+        self.plan(self.lookAhead)
+        return dueKinds
+
+    def upcoming(self, count=spawnLookAhead):
+        """Returns the next count spawns as a list of (tick, obstacle kind), planning further ahead if needed. They
+        only change if the difficulty does."""
+        self.plan(count)
+        return [(tick, kind) for tick, number, kind in heapq.nsmallest(count, self.queue)]
+
+
+class StepClock:
+    """Fixed timestep scheduler that tells the game loop how many ticks are due."""
+    def __init__(self, stepLength=1 / ticksPerSecond, maxSteps=maxCatchUpSteps, clock=time.monotonic):
+        """Constructs a step clock object."""
+        self.stepLength = stepLength
+        self.maxSteps = maxSteps
+        self.clock = clock
+        self.lastTime = clock()
+        self.accumulator = 0.0
+
+    def reset(self):
+        """Starts timing from now, forgetting any time that was already owed."""
+        self.lastTime = self.clock()
+        self.accumulator = 0.0
+
+    def advance(self):
+        """Returns the number of ticks that are due since the last call."""
+        now = self.clock()
+        self.accumulator += now - self.lastTime
+        self.lastTime = now
+
+        steps = int(self.accumulator // self.stepLength)
+        self.accumulator -= steps * self.stepLength
+
+        # Drop the time we can't catch up on instead of spiralling further behind
+        if steps > self.maxSteps:
+            steps = self.maxSteps
+            self.accumulator = 0.0
+        return steps
+
+    def timeUntilNextStep(self):
+        """Returns how long the game loop can sleep before the next tick is due."""
+        remaining = self.stepLength - self.accumulator - (self.clock() - self.lastTime)
+        return max(remaining, 0.0)
+
+
+class GameState:
+    """Everything the game needs to know about a run, with no reference to a window."""
+    def __init__(self, gamemode="highscore", seed=None, width=worldWidth, scrollSpeed=backgroundSpeed,
+                 timers=difficultyTimers):
+        """Constructs a game state object, scrollSpeed and timers (the obstacle timer of each difficulty) can be
+        changed to try out other tunings of the game."""
+        self.gamemode = gamemode
+        self.width = width
+        self.scrollSpeed = scrollSpeed
+        self.difficultyTimers = timers
+
+        # Every run gets a seed so it can be recorded and replayed exactly
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.characters = []
+        self.obstacles = ObstacleField()
+        self.spawner = SpawnScheduler(self.rng, timers)
+        self.difficulty = difficultyNames[0]
+        self.leader = ""
+        self.ticks = 0
+        self.sec = 0
+        self.highScore = 0
+
+        # Every (player, action bit) each key is bound to, and the input mask of each player this tick
+        self.keyMap = {}
+        self.inputs = []
+
+        # Seconds survived before the last hit
+        self.lastScore = 0
+
+        # Characters hit this tick and the box each obstacle's hitbox is put in to check it, reused every tick
+        self.hit = []
+        self.obstacleBox = AABB()
+
+    def addCharacter(self, character):
+        """Adds a character to the run and binds its controls."""
+        character.idleSpeed = self.scrollSpeed - idleDrift
+        player = len(self.characters)
+        self.characters.append(character)
+        self.inputs.append(0)
+        for bit in range(len(actions)):
+            key = character.controls[bit]
+            self.keyMap[key] = self.keyMap.get(key, ()) + ((player, 1 << bit),)
+
+    def resolveInput(self, keys):
+        """Turns the set of keys pressed into the input mask of every player in one pass over the keys, returns the
+        list of masks (reused by the next call)."""
+        inputs = self.inputs
+        for player in range(len(inputs)):
+            inputs[player] = 0
+        keyMap = self.keyMap
+        for key in keys:
+            bindings = keyMap.get(key)
+            if bindings is not None:
+                for player, bit in bindings:
+                    inputs[player] |= bit
+        return inputs
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Character States
+
+# In the order of the state ids, a new state only needs an id, a row here and a row in the sprites' stateAnimations
+# (a jump ends when the character lands)
+characterStates = (CharacterState("standing idle", 1, standingIdle),
+                   CharacterState("running", 3, running),
+                   CharacterState("crouching", 3, crouching, crouched=True),
+                   CharacterState("crouching idle", 1, crouchingIdle, crouched=True),
+                   CharacterState("jumping", 1, jumping))
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Obstacle Types
+
+# In the order of spawnWeights
+obstacleKinds = (ObstacleKind("Spike", "assets/images/obstacles/Spikes.png", 415, .25, (126, 112, 126, 126)),
+                 ObstacleKind("CreepyCrawly", "assets/images/obstacles/CreepyCrawly.png", 415, .25,
+                              (126, 112, 126, 126)),
+                 ObstacleKind("Rocket", "assets/images/obstacles/Rocket.png", 340, .25, (75, 130, 104, 127)),
+                 ObstacleKind("SpaceInvader", "assets/images/obstacles/SpaceInvader.png", 340, .3, (75, 130, 104, 127)),
+                 ObstacleKind("Monkey", "assets/images/obstacles/Monkey.png", 310, .5, (75, 130, 104, 127)))
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def createObstacle(state, kind):
+    """Adds an obstacle of kind (an index into obstacleKinds) to the game state, returns its id."""
+    return state.obstacles.spawn(kind, spawnX)
+
+
+def checkCollision(state):
+    """Checks every character against the obstacles, returns the characters that were hit.
+    The returned list is reused by the next tick."""
+    hit = findCollisions(state.characters, state.obstacles, state.hit, state.obstacleBox)
+
+    # Keep the time survived before the timer is reset
+    if hit:
+        state.lastScore = state.sec
+
+    # Moves a character all the way to the left (backwards) if they hit a spike and reset the timer, add a mistake
+    for character in hit:
+        character.x = 20
+        character.mistakes += 1
+        state.sec = 0
+
+    # Update the current leader based on who has the least mistakes (the first player wins a tie)
+    if hit and state.gamemode == "multiplayer":
+        leader = 0
+        for player in range(1, len(state.characters)):
+            if state.characters[player].mistakes < state.characters[leader].mistakes:
+                leader = player
+        state.leader = "Player {}".format(leader + 1)
+
+    return hit
+
+
+def updateDifficulty(state):
+    """Speeds up the game/changes difficulty if the player survives for -- seconds."""
+    level = bisect_right(difficultySeconds, state.sec)
+    state.spawner.setLevel(level)
+    state.difficulty = difficultyNames[level]
+    if level == 2:
+        for character in state.characters:
+            if character.name != "Rainbow":
+                character.name = "Rainbow"
+    elif level == 0:
+        for character in state.characters:
+            if character.name == "Rainbow":
+                character.name = character.trueIdentity
+
+
+def step(state, keys, profiler=None):
+    """Advances the game by one tick using the set of keys currently pressed, returns any characters that were hit
+    (the list is reused by the next tick). profiler is an optional FrameProfiler that times each phase."""
+    return stepInputs(state, state.resolveInput(keys), profiler)
+
+
+def stepInputs(state, inputs, profiler=None):
+    """Advances the game by one tick using the input mask of each player (see GameState.resolveInput()), returns
+    any characters that were hit like step()."""
+    state.ticks += 1
+
+    # If a second has passed, add a second to the timer
+    if state.ticks % ticksPerSecond == 0:
+        state.sec += 1
+
+    # Create the obstacles planned for this tick
+    for kind in state.spawner.due(state.ticks):
+        createObstacle(state, kind)
+    if profiler is not None:
+        profiler.mark("sim spawn")
+
+    # Move characters
+    characters = state.characters
+    for player in range(len(characters)):
+        character = characters[player]
+        character.advanceAnimation(tickSeconds)
+        character.move(inputs[player], tickSeconds)
+        character.checkBorders(state.width)
+    if profiler is not None:
+        profiler.mark("sim chars")
+
+    # Move obstacles and remove them once they are off the screen
+    state.obstacles.advance(state.scrollSpeed * tickSeconds)
+    if profiler is not None:
+        profiler.mark("sim obst")
+
+    updateDifficulty(state)
+
+    # Update the high score each time a new high score is reached
+    if state.sec > state.highScore:
+        state.highScore = state.sec
+    if profiler is not None:
+        profiler.mark("difficulty")
+
+    hit = checkCollision(state)
+    if profiler is not None:
+        profiler.mark("collision")
+    return hit
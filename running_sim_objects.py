@@ -1,446 +1,339 @@
-# -------------------------------------------------------------------------------------------------------------------- #
-# Program: Running Simulator 2k19 Objects
-# Authors: Michael Schmauderer and Jake Rutkowski
-# Description: Objects for the running sim 2k19 game.
-# Date Modified: 5/27/2019
-# Version: 1.1
-
-# -------------------------------------------------------------------------------------------------------------------- #
-# Import Libraries
-from graphics import *
-
-# -------------------------------------------------------------------------------------------------------------------- #
-# Global Variables
-backgroundSpeed = 2
-idleCharacterSpeed = backgroundSpeed - .5
-
-# -------------------------------------------------------------------------------------------------------------------- #
-# Classes
-
-
-class Character:
-    """Basic building blocks for a character."""
-    def __init__(self, x, y, name, speed, window, controls, size=1, rotation=0):
-        """Constructs a character object."""
-        self.x = x
-        self.y = y
-        self.name = name
-        self.trueIdentity = name
-        self.speed = speed
-        self.window = window
-        self.size = size
-        self.rotation = rotation
-        self.imageCycle = 0
-        self.direction = "right"
-        self.state = "standing idle"
-        self.isJumping = False
-        self.jumpHeights = (25, 20, 15, 12, 9, 6, 1, -1, -6, -9, -12, -15, -20, -25)
-        self.controls = controls
-        self.runLeft = []
-        self.runRight = []
-        self.duckLeft = []
-        self.duckRight = []
-        self.createAnimations()
-        characters = []
-        characters.append(self)
-        self.mistakes = 0
-
-    def createAnimations(self):
-        """Creates lists of images for each animation."""
-
-        # Images for running to the left (all in order of how they will be used)
-        self.runLeft.append(Image(Point(self.x, self.y),
-                                  "assets/images/characters/{}/{}-upLeft.png".format(self.name, self.name)))
-        self.runLeft.append(Image(Point(self.x, self.y),
-                                  "assets/images/characters/{}/{}-upMidLeft.png".format(self.name, self.name)))
-        self.runLeft.append(Image(Point(self.x, self.y),
-                                  "assets/images/characters/{}/{}-upLeft.png".format(self.name, self.name)))
-
-        # Images for running to the right
-        self.runRight.append(Image(Point(self.x, self.y),
-                                   "assets/images/characters/{}/{}-upRight.png".format(self.name, self.name)))
-        self.runRight.append(Image(Point(self.x, self.y),
-                                   "assets/images/characters/{}/{}-upMidRight.png".format(self.name, self.name)))
-        self.runRight.append(Image(Point(self.x, self.y),
-                                   "assets/images/characters/{}/{}-upRight.png".format(self.name, self.name)))
-
-        # Images for ducking to the left
-        self.duckLeft.append(Image(Point(self.x, self.y),
-                                   "assets/images/characters/{}/{}-downLeft.png".format(self.name, self.name)))
-        self.duckLeft.append(Image(Point(self.x, self.y),
-                                   "assets/images/characters/{}/{}-downMidLeft.png".format(self.name, self.name)))
-        self.duckLeft.append(Image(Point(self.x, self.y),
-                                   "assets/images/characters/{}/{}-downLeft.png".format(self.name, self.name)))
-
-        # Images for ducking to the right
-        self.duckRight.append(Image(Point(self.x, self.y),
-                                    "assets/images/characters/{}/{}-downRight.png".format(self.name, self.name)))
-        self.duckRight.append(Image(Point(self.x, self.y),
-                                    "assets/images/characters/{}/{}-downMidRight.png".format(self.name, self.name)))
-        self.duckRight.append(Image(Point(self.x, self.y),
-                                    "assets/images/characters/{}/{}-downRight.png".format(self.name, self.name)))
-
-    def clearAnimations(self):
-        """Clears the animation lists."""
-        self.runLeft.clear()
-        self.runRight.clear()
-        self.duckLeft.clear()
-        self.duckRight.clear()
-
-    def draw(self):
-        """Draws the object by updating the anchor point."""
-
-        # Help organize and make main() less redundant
-        self.undraw()
-        self.move()
-
-        # Chooses an animation list based on the current state
-        if self.state == "running":
-
-            # Narrows down the animation list even further using the current direction
-            if self.direction == "left":
-
-                # Transform the image based on size and rotation
-                self.runLeft[self.imageCycle].transform(self.size, self.rotation)
-
-                # Resets the anchor point of the image as the x and y values have likely changed
-                self.runLeft[self.imageCycle].anchor = Point(self.x, self.y)
-
-                # Draws the image
-
-                self.runLeft[self.imageCycle].draw(self.window)
-
-            elif self.direction == "right":
-                self.runRight[self.imageCycle].transform(self.size, self.rotation)
-                self.runRight[self.imageCycle].anchor = Point(self.x, self.y)
-                self.runRight[self.imageCycle].draw(self.window)
-
-        elif self.state == "standing idle":
-            if self.direction == "left":
-                # No iterator needed for idle images because they are a single frame
-                self.runLeft[0].transform(self.size, self.rotation)
-                self.runLeft[0].anchor = Point(self.x, self.y)
-                self.runLeft[0].draw(self.window)
-            elif self.direction == "right":
-                self.runRight[0].transform(self.size, self.rotation)
-                self.runRight[0].anchor = Point(self.x, self.y)
-                self.runRight[0].draw(self.window)
-
-        elif self.state == "crouching":
-            if self.direction == "left":
-                self.duckLeft[self.imageCycle].transform(self.size, self.rotation)
-                self.duckLeft[self.imageCycle].anchor = Point(self.x, self.y)
-                self.duckLeft[self.imageCycle].draw(self.window)
-            elif self.direction == "right":
-                self.duckRight[self.imageCycle].transform(self.size, self.rotation)
-                self.duckRight[self.imageCycle].anchor = Point(self.x, self.y)
-                self.duckRight[self.imageCycle].draw(self.window)
-
-        elif self.state == "crouching idle":
-            if self.direction == "left":
-                self.duckLeft[0].transform(self.size, self.rotation)
-                self.duckLeft[0].anchor = Point(self.x, self.y)
-                self.duckLeft[0].draw(self.window)
-            elif self.direction == "right":
-                self.duckRight[0].transform(self.size, self.rotation)
-                self.duckRight[0].anchor = Point(self.x, self.y)
-                self.duckRight[0].draw(self.window)
-
-        elif self.state == "jumping":
-            if self.direction == "left":
-                self.runLeft[0].transform(self.size, self.rotation)
-                self.runLeft[0].anchor = Point(self.x, self.y)
-                self.runLeft[0].draw(self.window)
-            elif self.direction == "right":
-                self.runRight[0].transform(self.size, self.rotation)
-                self.runRight[0].anchor = Point(self.x, self.y)
-                self.runRight[0].draw(self.window)
-
-        # Always check if the character has left the play area after each movement
-        self.checkBorders()
-
-    def undraw(self):
-        """Undraws the object and adjusts the animation iterator."""
-
-        # Once again chooses an animation list based on current state
-        if self.state == "running":
-
-            # Narrowed down by current direction
-            if self.direction == "left":
-
-                # Undraw the current image
-                self.runLeft[self.imageCycle].undraw()
-
-                # Increments the imageCycle variable if it is an index within the animation list
-                if self.imageCycle < len(self.runLeft) - 1:
-                    self.imageCycle += 1
-
-                # Reset the imageCycle variable to 0 after the last index is reached
-                else:
-                    self.imageCycle = 0
-
-            elif self.direction == "right":
-                self.runRight[self.imageCycle].undraw()
-                if self.imageCycle < len(self.runRight) - 1:
-                    self.imageCycle += 1
-                else:
-                    self.imageCycle = 0
-
-        # No need to reset imageCycle here since it is an idle image and does not use that variable
-        elif self.state == "standing idle":
-            if self.direction == "left":
-                self.runLeft[0].undraw()
-            elif self.direction == "right":
-                self.runRight[0].undraw()
-
-        elif self.state == "crouching":
-            if self.direction == "left":
-                self.duckLeft[self.imageCycle].undraw()
-                if self.imageCycle < len(self.duckLeft) - 1:
-                    self.imageCycle += 1
-                else:
-                    self.imageCycle = 0
-
-            elif self.direction == "right":
-                self.duckRight[self.imageCycle].undraw()
-                if self.imageCycle < len(self.duckRight) - 1:
-                    self.imageCycle += 1
-                else:
-                    self.imageCycle = 0
-
-        elif self.state == "crouching idle":
-            if self.direction == "left":
-                self.duckLeft[0].undraw()
-            elif self.direction == "right":
-                self.duckRight[0].undraw()
-
-        elif self.state == "jumping":
-            if self.imageCycle < len(self.jumpHeights) - 1:
-                self.imageCycle += 1
-            else:
-                self.imageCycle = 0
-                self.isJumping = False
-                self.state = "standing idle"
-
-            if self.direction == "left":
-                # The frame used for jumping is the same as the frame used for idle
-                self.runLeft[0].undraw()
-
-            elif self.direction == "right":
-                self.runRight[0].undraw()
-
-    def move(self):
-        """Updates the state, direction and coordinates of the image based on key input."""
-
-        # Store keys pressed in a set called keys
-        keys = self.window.checkKeys()
-
-        # Not hardcoded key values because different characters may have different controls
-        # Tests keys being pressed
-
-        # Crouching
-        if self.controls[2] in keys and not self.isJumping:
-
-            # Running right while crouching
-            if self.controls[3] in keys:
-
-                # Updates the state
-                self.state = "crouching"
-
-                # Updates the direction
-                self.direction = "right"
-
-                # Updates the x value
-                self.x += self.speed
-
-                # Resets the imageCycle variable if state or direction change
-                if self.state != "crouching" or self.direction != "right":
-                    self.imageCycle = 0
-
-            # Running left while crouching
-            elif self.controls[1] in keys:
-                self.state = "crouching"
-                self.direction = "left"
-                self.x -= self.speed
-                if self.state != "crouching" or self.direction != "left":
-                    self.imageCycle = 0
-
-            # Crouching idle
-            else:
-                self.state = "crouching idle"
-                self.imageCycle = 0
-                self.x -= idleCharacterSpeed
-
-        # Jumping
-        elif self.controls[0] in keys or self.state == "jumping":
-            self.isJumping = True
-            if self.state != "jumping":
-                self.state = "jumping"
-            self.y -= self.jumpHeights[self.imageCycle]
-
-            # Jumping to the right
-            if self.controls[3] in keys:
-                self.direction = "right"
-                self.x += self.speed + 3
-
-            # Jumping to the left
-            elif self.controls[1] in keys:
-                self.direction = "left"
-                self.x -= self.speed + 3
-
-        # Running to the right
-        elif self.controls[3] in keys:
-            self.state = "running"
-            self.direction = "right"
-            self.x += self.speed
-            if self.state != "running" or self.direction != "right":
-                self.imageCycle = 0
-
-        # Running to the left
-        elif self.controls[1] in keys:
-            self.state = "running"
-            self.direction = "left"
-            self.x -= self.speed
-            if self.state != "running" or self.direction != "left":
-                self.imageCycle = 0
-
-        # Idle
-        else:
-            self.imageCycle = 0
-            self.state = "standing idle"
-            self.x -= idleCharacterSpeed
-
-    def checkBorders(self):
-        """Keeps characters on the screen."""
-
-        # Left border
-        if self.x - (8 * self.size) < 0:
-            self.x = 8 * self.size
-
-        # Right border
-        if self.x + (8 * self.size) > self.window.getWidth():
-            self.x = self.window.getWidth()-(8 * self.size)
-
-        # Top border
-        if self.y - (12 * self.size) < 0:
-            self.y = 12 * self.size
-
-        # Bottom border
-        if self.y + (8 * self.size) > 431:
-            self.y = 431 - (12 * self.size)
-
-
-class Spike:
-    """Basic building block for a spike object."""
-    def __init__(self, x, y, size, imagePath, window):
-        """Constructs a spike object."""
-        self.x = x
-        self.y = y
-        self.size = size
-        self.imagePath = imagePath
-        self.window = window
-        self.image = Image(Point(self.x, self.y), self.imagePath)
-        self.image.transform(size)
-        self.hitBox = Rectangle(Point(0, 0), Point(0, 0))
-
-    def draw(self):
-        """Draws a spike object."""
-        self.undraw()
-        self.move(backgroundSpeed)
-        self.image = Image(Point(self.x, self.y), self.imagePath)
-        self.image.transform(self.size)
-        self.image.draw(self.window)
-
-        # Creates a hitbox for the spike object (these numbers are calculated through guess & check)
-        self.hitBox = Rectangle(Point(self.x - (126 * self.size), self.y - (112 * self.size)),
-                                Point(self.x + (126 * self.size), self.y + (126 * self.size)))
-        self.hitBox.setOutline("red")
-
-        # Only used for testing purposes
-        #self.hitBox.draw(self.window)
-
-    def undraw(self):
-        """Undraws an obstacle."""
-        self.image.undraw()
-        self.hitBox.undraw()
-
-    def move(self, speed):
-        """Moves an obstacle by editing the x value."""
-        self.x -= speed
-
-
-class Monkey(Spike):
-    """Basic building block for a monkey object."""
-    def draw(self):
-        """Draws a monkey object."""
-        self.undraw()
-        self.move(backgroundSpeed)
-        self.image = Image(Point(self.x, self.y), self.imagePath)
-        self.image.transform(self.size)
-        self.image.draw(self.window)
-
-        # Creates a hitbox for the monkey object (these numbers are calculated through guess & check)
-        self.hitBox = Rectangle(Point(self.x - (75 * self.size), self.y - (130 * self.size)),
-                                Point(self.x + (104 * self.size), self.y + (127 * self.size)))
-        self.hitBox.setOutline("red")
-
-        # Only used for testing purposes
-        #self.hitBox.draw(self.window)
-
-
-class CreepyCrawly(Spike):
-    """Basic building block for a Creepy Crawly object"""
-    def draw(self):
-        """Draws a creepy crawly object."""
-        self.undraw()
-        self.move(backgroundSpeed)
-        self.image = Image(Point(self.x, self.y), self.imagePath)
-        self.image.transform(self.size)
-        self.image.draw(self.window)
-
-        # Creates hitbox for the creepy crawly object (these numbers are calculated through guess & check)
-        self.hitBox = Rectangle(Point(self.x - (126 * self.size), self.y - (112 * self.size)),
-                                Point(self.x + (126 * self.size), self.y + (126 * self.size)))
-        self.hitBox.setOutline("red")
-
-        # Only used for testing purposes
-        # self.hitBox.draw(self.window)
-
-
-class Rocket(Spike):
-    """Basic building block for a rocket object"""
-    def draw(self):
-        """Draws a rocket object."""
-        self.undraw()
-        self.move(backgroundSpeed)
-        self.image = Image(Point(self.x, self.y), self.imagePath)
-        self.image.transform(self.size)
-        self.image.draw(self.window)
-
-        # Creates hitbox for the rocket object (these numbers are calculated through guess & check)
-        self.hitBox = Rectangle(Point(self.x - (75 * self.size), self.y - (130 * self.size)),
-                                Point(self.x + (104 * self.size), self.y + (127 * self.size)))
-        self.hitBox.setOutline("red")
-
-        # Only used for testing purposes
-        # self.hitBox.draw(self.window)
-
-
-class SpaceInvader(Spike):
-    """Basic building block for a rocket object"""
-
-    def draw(self):
-        """Draws a space invader object."""
-        self.undraw()
-        self.move(backgroundSpeed)
-        self.image = Image(Point(self.x, self.y), self.imagePath)
-        self.image.transform(self.size)
-        self.image.draw(self.window)
-
-        # Creates hitbox for the space invader object (these numbers are calculated through guess & check)
-        self.hitBox = Rectangle(Point(self.x - (75 * self.size), self.y - (130 * self.size)),
-                                Point(self.x + (104 * self.size), self.y + (127 * self.size)))
-        self.hitBox.setOutline("red")
-
-        # Only used for testing purposes
-        # self.hitBox.draw(self.window)
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Objects
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Drawable objects for the running sim 2k19 game. These only draw the state kept by running_sim_engine.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+from graphics import *
+from running_sim_engine import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+
+# Compiled frame tables shared by every sprite, keyed by (name, size, rotation)
+characterAtlas = {}
+
+# The poses used by each animation (all in order of how they will be used)
+animationPoses = {"runLeft": ("upLeft", "upMidLeft", "upLeft"),
+                  "runRight": ("upRight", "upMidRight", "upRight"),
+                  "duckLeft": ("downLeft", "downMidLeft", "downLeft"),
+                  "duckRight": ("downRight", "downMidRight", "downRight")}
+
+# The animation shown in each character state (in the order of characterStates) and whether it cycles through its
+# frames or holds the first one, the direction is added to the name (runLeft, runRight)
+stateAnimations = (("run", False),
+                   ("run", True),
+                   ("duck", True),
+                   ("duck", False),
+                   ("run", False))
+
+# Images the game draws, and the size the characters are drawn at
+backgroundPath = "assets/images/maps/ogBackground.png"
+startScreenPath = "assets/images/menus/runningSimulatorStartScreen.png"
+controlsScreenPath = "assets/images/menus/runningSimulatorControlsScreen.png"
+multiplayerControlsScreenPath = "assets/images/menus/runningSimulatorMultiplayerControlsScreen.png"
+characterScreenPath = "assets/images/menus/runningSimulatorCharacterScreen.png"
+playableCharacters = ("Jamir", "Shalissa", "Weeb Sean", "Shadow Man")
+characterNames = playableCharacters + ("Rainbow",)
+characterSize = 3
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def characterImagePath(name, pose):
+    """Returns the file of one pose of a character."""
+    return "assets/images/characters/{}/{}-{}.png".format(name, name, pose)
+
+
+def characterImagePaths(name):
+    """Returns the files of every pose a character's animations use."""
+    return [characterImagePath(name, pose) for pose in sorted(set(sum(animationPoses.values(), ())))]
+
+
+def gameImages():
+    """Returns (path, scale, angle) for every image the game draws, in the scales it draws them at."""
+    images = [(path, 1, 0) for path in (startScreenPath, characterScreenPath, controlsScreenPath,
+                                         multiplayerControlsScreenPath, backgroundPath)]
+    for kind in obstacleKinds:
+        images.append((kind.imagePath, kind.size, 0))
+    for name in characterNames:
+        for path in characterImagePaths(name):
+            images.append((path, characterSize, 0))
+    return images
+
+
+def compileFrameTable(animations):
+    """Returns the frame for every tick of every state and direction of a character, table[state][direction] is the
+    list of frames indexed by imageCycle. animations maps each name in animationPoses to its frames."""
+    table = []
+    for state in range(len(characterStates)):
+        animation, cycles = stateAnimations[state]
+        frameCount = characterStates[state].frameCount
+        directions = []
+        for direction in directionNames:
+            frames = animations[animation + direction.capitalize()]
+            if cycles:
+                directions.append([frames[cycle % len(frames)] for cycle in range(frameCount)])
+            else:
+                directions.append([frames[0]] * frameCount)
+        table.append(directions)
+    return table
+
+
+def loadCharacterFrames(name, size=1, rotation=0):
+    """Returns the compiled frame table of a character (see compileFrameTable()), each distinct frame is decoded and
+    scaled once per process."""
+    key = (name, size, rotation)
+    if key not in characterAtlas:
+        poses = {}
+        for pose in set(sum(animationPoses.values(), ())):
+            image = Image(Point(0, 0), characterImagePath(name, pose))
+            image.transform(size, rotation)
+            poses[pose] = image.img
+
+        characterAtlas[key] = compileFrameTable({animation: [poses[pose] for pose in animationPoses[animation]]
+                                                 for animation in animationPoses})
+    return characterAtlas[key]
+
+
+def showText(text, value, window):
+    """Updates a text in place, drawing it in window the first time it is shown."""
+    text.setText(value)
+    if text.canvas is None:
+        text.draw(window)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class CharacterSprite:
+    """Draws a character from the engine."""
+    def __init__(self, character, window):
+        """Constructs a character sprite object."""
+        self.character = character
+        self.window = window
+        self.image = Image(Point(character.x, character.y), 0, 0)
+
+        # Preload the Rainbow frames too so Hard mode only has to swap references
+        self.frames = loadCharacterFrames(character.name, character.size, character.rotation)
+        loadCharacterFrames("Rainbow", character.size, character.rotation)
+        self.animationName = character.name
+
+    def currentFrame(self):
+        """Returns the frame for the current state, direction and tick of the character's animation."""
+        character = self.character
+        return self.frames[character.state][character.direction][character.imageCycle]
+
+    def draw(self):
+        """Draws the character at its current position, updating the existing canvas item once it is drawn."""
+        character = self.character
+
+        # Swap to the other identity's frames if the character changed (e.g. Rainbow in Hard mode)
+        if character.name != self.animationName:
+            self.frames = loadCharacterFrames(character.name, character.size, character.rotation)
+            self.animationName = character.name
+
+        # Resets the frame and anchor point of the image, unchanged values are skipped by graphics
+        self.image.setImage(self.currentFrame())
+        self.image.setAnchor(character.x, character.y)
+
+        # Draws the image the first time
+        if self.image.canvas is None:
+            self.image.draw(self.window)
+
+    def undraw(self):
+        """Undraws the character."""
+        self.image.undraw()
+
+
+class ObstacleSprite:
+    """Draws an obstacle from the engine's obstacle field."""
+    def __init__(self, kind, x, y, window, group=None):
+        """Constructs an obstacle sprite object, loading and scaling its image once. If group is given (a Group of
+        window) the sprite scrolls with it."""
+        self.window = window
+        self.image = Image(Point(x, y), kind.imagePath)
+        self.image.transform(kind.size)
+
+        # Outline of the hitbox used by the engine
+        left, top, right, bottom = kind.hitBoxExtents
+        self.hitBox = Rectangle(Point(x - (left * kind.size), y - (top * kind.size)),
+                                Point(x + (right * kind.size), y + (bottom * kind.size)))
+        self.hitBox.setOutline("red")
+        if group is not None:
+            group.add(self.image)
+            group.add(self.hitBox)
+
+    def draw(self, x):
+        """Draws an obstacle the first time, afterwards only moves the existing canvas item to x."""
+
+        # Create the canvas item once
+        if self.image.canvas is None:
+            self.image.draw(self.window)
+
+            # Only used for testing purposes
+            #self.hitBox.draw(self.window)
+
+        # Slide the existing items to where the engine has moved the obstacle (already there if its group scrolled)
+        else:
+            dx = x - self.image.anchor.x
+            if dx:
+                self.image.move(dx, 0)
+                self.hitBox.move(dx, 0)
+
+    def undraw(self):
+        """Undraws an obstacle and takes it out of its group."""
+        for item in (self.image, self.hitBox):
+            item.undraw()
+            if item.group is not None:
+                item.group.remove(item)
+
+
+class WorldRenderer:
+    """Draws a game state every frame: the characters, the scrolling background and obstacles, and the HUD."""
+    def __init__(self, state, window):
+        """Constructs a world renderer object, the background is created later by createBackground()."""
+        self.state = state
+        self.window = window
+        self.characterSprites = []
+
+        # Obstacle sprites keyed by obstacle id
+        self.obstacleSprites = {}
+
+        # The background and obstacles scroll together as one canvas tag, moved to the engine's scroll once a frame
+        self.world = Group(window, "world")
+        self.worldScroll = 0.0
+        self.backgrounds = ()
+
+        # HUD for highscore mode (seconds and high score) and for multiplayer (mistakes and leader)
+        self.secondsTimer = Text(Point(985, 30), "")
+        self.secondsTimer.setSize(34)
+        self.secondsTimer.setStyle("bold")
+        self.highScoreCounter = Text(Point(window.getWidth()//2, 30), "")
+        self.highScoreCounter.setSize(30)
+        self.highScoreCounter.setStyle("bold")
+        self.highScoreCounter.setTextColor("red")
+        self.scores = Text(Point(920, 65), "")
+        self.scores.setSize(24)
+        self.scores.setStyle("bold")
+        self.leaderID = Text(Point(window.getWidth()//2, 30), "")
+        self.leaderID.setSize(30)
+        self.leaderID.setStyle("bold")
+        self.leaderID.setTextColor("red")
+        self.difficultyID = Text(Point(170, 30), "")
+        self.difficultyID.setSize(26)
+        self.difficultyID.setStyle("bold")
+
+    def createBackground(self):
+        """Creates the two background tiles once their image is loaded, they scroll with the world."""
+        self.backgrounds = (Image(Point(512, 256), backgroundPath), Image(Point(1536, 256), backgroundPath))
+        for back in self.backgrounds:
+            self.world.add(back)
+
+    def drawBackground(self):
+        """Draws the background tiles."""
+        for back in self.backgrounds:
+            back.draw(self.window)
+
+    def addCharacter(self, character):
+        """Adds a sprite to draw a character of the state."""
+        self.characterSprites.append(CharacterSprite(character, self.window))
+
+    def moveBackground(self):
+        """Scrolls the background and every obstacle as far as the engine has scrolled since the last frame, with one
+        Tk call however many obstacles there are."""
+        dx = self.worldScroll - self.state.obstacles.scroll
+        if dx:
+            self.world.move(dx, 0)
+            self.worldScroll = self.state.obstacles.scroll
+
+        # Moves a background image from past the left side to past the right side, reusing its canvas item
+        for back in self.backgrounds:
+            if back.anchor.x <= -512:
+                back.move(2048, 0)
+
+    def drawObstacles(self):
+        """Draws every obstacle in the game state and removes the sprites of obstacles that are gone.
+        Returns True if a new obstacle was put on the screen."""
+        field = self.state.obstacles
+        obstacleSprites = self.obstacleSprites
+        created = False
+        for i in range(len(field)):
+            obstacleId = field.id[i]
+            x = field.x(i)
+            sprite = obstacleSprites.get(obstacleId)
+            if sprite is None:
+                sprite = obstacleSprites[obstacleId] = ObstacleSprite(obstacleKinds[field.kind[i]], x, field.y[i],
+                                                                      self.window, self.world)
+                created = True
+            sprite.draw(x)
+
+        # Remove obstacles once they are off the screen (lag), ids only ever increase so anything older than the
+        # first obstacle left in the field is gone
+        if len(obstacleSprites) != len(field):
+            firstId = field.id[0] if len(field) else field.nextId
+            for obstacleId in list(obstacleSprites):
+                if obstacleId < firstId:
+                    obstacleSprites.pop(obstacleId).undraw()
+        return created
+
+    def drawHUD(self, liftText=False):
+        """Updates the timers, scores and difficulty text from the game state.
+        Unchanged text is skipped by graphics, so this costs almost nothing most frames."""
+        state = self.state
+        window = self.window
+        if state.gamemode == "highscore":
+            # Update the seconds timer for highscore mode (singleplayer)
+            showText(self.secondsTimer, state.sec, window)
+
+            # Update the high score counter for highscore mode (singleplayer)
+            showText(self.highScoreCounter, "High Score: {}".format(state.highScore), window)
+            hud = (self.secondsTimer, self.highScoreCounter, self.difficultyID)
+        else:
+            # Update the scores counters
+            showText(self.scores, "Mistakes\n" + "\n".join("Player {}: {}".format(player + 1, character.mistakes)
+                                                            for player, character in enumerate(state.characters)),
+                     window)
+
+            # Update the leader ID
+            showText(self.leaderID, "Leader: {}".format(state.leader), window)
+            hud = (self.scores, self.leaderID, self.difficultyID)
+
+        # Update the difficulty ID
+        showText(self.difficultyID, "Difficulty: {}".format(state.difficulty), window)
+
+        # Keep the text above anything that was created after it
+        if liftText:
+            for text in hud:
+                text.lift()
+
+    def draw(self, profiler=None):
+        """Draws the current game state, profiler is an optional FrameProfiler that times each phase."""
+        for sprite in self.characterSprites:
+            sprite.draw()
+        if profiler is not None:
+            profiler.mark("draw chars")
+
+        # Scroll the obstacles already drawn before new ones are put where the engine has them
+        self.moveBackground()
+        if profiler is not None:
+            profiler.mark("background")
+        createdObstacle = self.drawObstacles()
+        if profiler is not None:
+            profiler.mark("draw obst")
+        self.drawHUD(createdObstacle)
+        if profiler is not None:
+            profiler.mark("hud")
+
+    def undraw(self):
+        """Undraws everything the renderer has drawn."""
+        for sprite in self.characterSprites + list(self.obstacleSprites.values()):
+            sprite.undraw()
+        self.obstacleSprites.clear()
+        for item in self.backgrounds + (self.secondsTimer, self.highScoreCounter, self.scores, self.leaderID,
+                                        self.difficultyID):
+            item.undraw()
@@ -0,0 +1,165 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Asset Pack
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Builds and reads a single binary file holding every image the game draws, already decoded to RGBA and
+#              scaled to the size it is drawn at. The pack is memory mapped at runtime so loading a sprite needs no
+#              PNG decode or resize. Each entry stores a hash of its source PNG, entries whose PNG has changed are
+#              ignored and the game decodes that PNG instead. Build the pack from the repository root with:
+#              python running_sim_pack.py [assets/images.pack]
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import graphics
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+packPath = "assets/images.pack"
+packMagic = b"RS2KPACK"
+packVersion = 1
+
+# Magic, then the version and byte length of the JSON index that follows
+packHeader = "<8sII"
+
+# Pixel data starts on a multiple of this many bytes
+packAlignment = 16
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def sourceHash(path):
+    """Returns the content hash of a source file."""
+    with open(path, "rb") as sourceFile:
+        return hashlib.sha1(sourceFile.read()).hexdigest()
+
+
+def aligned(offset):
+    """Rounds offset up to the pack alignment."""
+    return (offset + packAlignment - 1) // packAlignment * packAlignment
+
+
+def openPack(path=packPath):
+    """Returns the AssetPack at path, or None if it is missing, unreadable or Pillow isn't installed."""
+    if not graphics.importedPillow or not os.path.exists(path):
+        return None
+    try:
+        return AssetPack(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def buildPack(path, images):
+    """Writes a pack holding every (source path, scale, angle) in images, along with each source at scale 1 (which
+    Image objects keep as their original)."""
+    transforms = {}
+    for source, scale, angle in images:
+        transforms.setdefault(source, [(1, 0)])
+        if (scale, angle) not in transforms[source]:
+            transforms[source].append((scale, angle))
+
+    # Decode and scale every image the same way the game would
+    entries = []
+    pixels = []
+    offset = 0
+    for source, sourceTransforms in transforms.items():
+        digest = sourceHash(source)
+        original = graphics.PILIMage.open(source)
+        for scale, angle in sourceTransforms:
+            image = original if scale == 1 and angle == 0 else graphics.transformPILImage(original, scale, angle)
+            data = image.convert("RGBA").tobytes()
+            entries.append({"path": source, "scale": scale, "angle": angle, "hash": digest,
+                            "width": image.width, "height": image.height, "offset": offset})
+            pixels.append(data)
+            offset = aligned(offset + len(data))
+
+    index = json.dumps({"entries": entries}).encode("utf-8")
+    dataStart = aligned(struct.calcsize(packHeader) + len(index))
+    with open(path, "wb") as packFile:
+        packFile.write(struct.pack(packHeader, packMagic, packVersion, len(index)))
+        packFile.write(index)
+        for entry, data in zip(entries, pixels):
+            packFile.seek(dataStart + entry["offset"])
+            packFile.write(data)
+    return len(entries)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class AssetPack:
+    """A memory mapped pack of prescaled RGBA images."""
+    def __init__(self, path):
+        """Constructs an asset pack object by mapping the file at path and reading its index."""
+        with open(path, "rb") as packFile:
+            self.data = mmap.mmap(packFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, indexLength = struct.unpack_from(packHeader, self.data, 0)
+        if magic != packMagic or version != packVersion:
+            self.data.close()
+            raise ValueError("{} is not a version {} asset pack".format(path, packVersion))
+        start = struct.calcsize(packHeader)
+        index = json.loads(bytes(self.data[start:start + indexLength]).decode("utf-8"))
+        dataStart = aligned(start + indexLength)
+
+        # {(path, scale, angle): (hash, width, height, offset)}
+        self.entries = {}
+        for entry in index["entries"]:
+            self.entries[(entry["path"], entry["scale"], entry["angle"])] = \
+                (entry["hash"], entry["width"], entry["height"], dataStart + entry["offset"])
+
+        # Content hash of each source checked so far, sources are only read once
+        self.sourceHashes = {}
+        self.view = memoryview(self.data)
+
+    def isFresh(self, path, scale=1, angle=0):
+        """Returns True if the pack holds path at this scale and angle and its source hasn't changed."""
+        entry = self.entries.get((path, scale, angle))
+        if entry is None:
+            return False
+        if path not in self.sourceHashes:
+            self.sourceHashes[path] = sourceHash(path) if os.path.exists(path) else None
+        return entry[0] == self.sourceHashes[path]
+
+    def image(self, path, scale=1, angle=0):
+        """Returns a PIL image that reads straight from the mapped file, or None if the entry is missing or stale."""
+        if not self.isFresh(path, scale, angle):
+            return None
+        digest, width, height, offset = self.entries[(path, scale, angle)]
+        pixels = self.view[offset:offset + width * height * 4]
+        return graphics.PILIMage.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+    def images(self, path, transforms):
+        """Returns (original, [(scale, angle, image), ...]) like decoding the PNG would, or None if any of them
+        can't come from the pack."""
+        original = self.image(path)
+        if original is None:
+            return None
+        images = []
+        for scale, angle in transforms:
+            image = self.image(path, scale, angle)
+            if image is None:
+                return None
+            images.append((scale, angle, image))
+        return original, images
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main
+
+
+def main(path=packPath):
+    """Builds the pack for every image the game draws."""
+    from running_sim_objects import gameImages
+    count = buildPack(path, gameImages())
+    print("Wrote {} images to {} ({:.1f} MB)".format(count, path, os.path.getsize(path) / 1e6))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
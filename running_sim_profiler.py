@@ -0,0 +1,116 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Profiler
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Times each phase of a game frame, keeps rolling p50/p95/p99 figures and writes every frame to a CSV
+#              file with one frame,phase,ms row per phase. While disabled every call returns straight away so it can
+#              stay in the game loop.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import json
+import os
+import time
+from collections import deque
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+
+# Percentiles reported for each phase
+percentiles = (50, 95, 99)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class FrameProfiler:
+    """Records how long each phase of a frame takes."""
+    def __init__(self, enabled=False, windowSize=300, logPath=None):
+        """Constructs a frame profiler object, logPath is the CSV file each frame is written to (optional)."""
+        self.enabled = enabled
+        self.windowSize = windowSize
+        self.logPath = logPath
+        self.logFile = None
+        self.phases = []
+        self.history = {}
+        self.frame = {}
+        self.frameCount = 0
+        self.frameStart = 0.0
+        self.lastMark = 0.0
+
+    def begin(self):
+        """Starts timing a frame."""
+        if not self.enabled:
+            return
+        self.frame = {}
+        self.frameStart = self.lastMark = time.perf_counter()
+
+    def mark(self, phase):
+        """Ends the current phase, the time since the last mark is added to phase."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame[phase] = self.frame.get(phase, 0.0) + now - self.lastMark
+        self.lastMark = now
+
+    def end(self):
+        """Finishes timing a frame and adds it to the rolling figures and the log."""
+        if not self.enabled or not self.frame:
+            return
+        self.frame["total"] = time.perf_counter() - self.frameStart
+
+        for phase, seconds in self.frame.items():
+            if phase not in self.history:
+                self.phases.append(phase)
+                self.history[phase] = deque(maxlen=self.windowSize)
+            self.history[phase].append(seconds)
+
+        if self.logPath:
+            self.writeFrame()
+        self.frameCount += 1
+
+    def writeFrame(self):
+        """Appends the current frame to the CSV log as one (frame, phase, ms) row per phase it timed, so phases that
+        only some frames have are never dropped."""
+        if self.logFile is None:
+            directory = os.path.dirname(self.logPath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.logFile = open(self.logPath, "w")
+            self.logFile.write("frame,phase,ms\n")
+        for phase, seconds in self.frame.items():
+            self.logFile.write("{},{},{:.4f}\n".format(self.frameCount, phase, seconds * 1000))
+
+    def setEnabled(self, enabled):
+        """Turns profiling on or off, the rolling figures are kept."""
+        self.enabled = enabled
+        if not enabled and self.logFile is not None:
+            self.logFile.flush()
+
+    def summary(self):
+        """Returns {phase: {"p50": ms, "p95": ms, "p99": ms}} over the rolling window."""
+        result = {}
+        for phase in self.phases:
+            times = sorted(self.history[phase])
+            result[phase] = {"p{}".format(p): times[min(len(times) - 1, len(times) * p // 100)] * 1000
+                             for p in percentiles}
+        return result
+
+    def report(self):
+        """Returns the summary as lines of text for the on screen overlay."""
+        lines = ["{:<11} {:>6} {:>6} {:>6}".format("phase (ms)", "p50", "p95", "p99")]
+        for phase, figures in self.summary().items():
+            lines.append("{:<11} {:6.2f} {:6.2f} {:6.2f}".format(phase, figures["p50"], figures["p95"], figures["p99"]))
+        return "\n".join(lines)
+
+    def writeSummary(self, path):
+        """Writes the rolling figures to a JSON file."""
+        with open(path, "w") as summaryFile:
+            json.dump({"frames": self.frameCount, "phases": self.summary()}, summaryFile, indent=2)
+
+    def close(self):
+        """Closes the CSV log."""
+        if self.logFile is not None:
+            self.logFile.close()
+            self.logFile = None
@@ -0,0 +1,156 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Replay
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Records the seed and every tick of player input for a run to a compact binary log, and replays a log
+#              through the engine headless as fast as the machine allows. Run a replay with:
+#              python running_sim_replay.py replays/last_run.rs2k
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import struct
+import sys
+import time
+import zlib
+from running_sim_engine import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+replayMagic = b"RS2K"
+replayVersion = 5
+
+# Version, seed, gamemode, world width, high score to beat at the start and player count
+headerFormat = "<BQBHIB"
+
+# Gamemodes are stored as a single byte
+gamemodes = ("highscore", "multiplayer")
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def packString(text):
+    """Returns a string as length prefixed utf-8 bytes."""
+    data = text.encode("utf-8")
+    return struct.pack("<B", len(data)) + data
+
+
+def unpackString(data, offset):
+    """Reads a length prefixed string, returns (string, new offset)."""
+    length = data[offset]
+    offset += 1
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class Recorder:
+    """Records the input of every player for each tick of a run."""
+    def __init__(self, state):
+        """Constructs a recorder object for a run that hasn't been stepped yet."""
+        self.state = state
+        self.header = self.packHeader()
+        self.ticks = 0
+
+        # One byte per player per tick, the input mask of each player (see actions in running_sim_engine)
+        self.inputs = bytearray()
+
+    def packHeader(self):
+        """Returns the bytes describing the seed, the high score to beat and the characters of the run."""
+        state = self.state
+        header = replayMagic + struct.pack(headerFormat, replayVersion, state.seed, gamemodes.index(state.gamemode),
+                                           state.width, state.highScore, len(state.characters))
+        for character in state.characters:
+            header += packString(character.name)
+            header += struct.pack("<ddddd", character.x, character.y, character.speed, character.size,
+                                  character.rotation)
+            for control in character.controls:
+                header += packString(control)
+        return header
+
+    def record(self, inputs):
+        """Records the input mask of every player for one tick (from GameState.resolveInput()), call once for every
+        step."""
+        self.inputs.extend(inputs)
+        self.ticks += 1
+
+    def save(self, path):
+        """Writes the log to path."""
+        body = zlib.compress(bytes(self.inputs), 9)
+        with open(path, "wb") as replayFile:
+            replayFile.write(self.header)
+            replayFile.write(struct.pack("<II", self.ticks, len(body)))
+            replayFile.write(body)
+
+
+class Replay:
+    """A recorded run loaded from a log."""
+    def __init__(self, path):
+        """Constructs a replay object by reading the log at path."""
+        with open(path, "rb") as replayFile:
+            data = replayFile.read()
+
+        if data[:4] != replayMagic:
+            raise ValueError("{} is not a replay log".format(path))
+        version = data[4]
+        if version != replayVersion:
+            raise ValueError("unsupported replay version {}".format(version))
+        self.seed, gamemode, self.width, self.highScore, playerCount = struct.unpack_from(headerFormat, data, 4)[1:]
+        self.gamemode = gamemodes[gamemode]
+        offset = 4 + struct.calcsize(headerFormat)
+
+        # Everything needed to rebuild each character
+        self.players = []
+        for i in range(playerCount):
+            name, offset = unpackString(data, offset)
+            x, y, speed, size, rotation = struct.unpack_from("<ddddd", data, offset)
+            offset += struct.calcsize("<ddddd")
+            controls = []
+            for action in actions:
+                control, offset = unpackString(data, offset)
+                controls.append(control)
+            self.players.append((name, x, y, speed, size, rotation, tuple(controls)))
+
+        self.ticks, bodyLength = struct.unpack_from("<II", data, offset)
+        offset += struct.calcsize("<II")
+        self.inputs = zlib.decompress(data[offset:offset + bodyLength])
+
+    def createState(self):
+        """Returns a fresh game state set up the same way as the recorded run."""
+        state = GameState(self.gamemode, self.seed, self.width)
+        state.highScore = self.highScore
+        for name, x, y, speed, size, rotation, controls in self.players:
+            state.addCharacter(Character(x, y, name, speed, controls, size, rotation))
+        return state
+
+    def run(self):
+        """Replays every tick through the engine, returns the final game state."""
+        state = self.createState()
+        playerCount = len(state.characters)
+        inputs = self.inputs
+        for offset in range(0, self.ticks * playerCount, playerCount):
+            stepInputs(state, inputs[offset:offset + playerCount])
+        return state
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main
+
+
+def main(path):
+    """Replays a log and prints the final scores."""
+    replay = Replay(path)
+    start = time.perf_counter()
+    state = replay.run()
+    elapsed = time.perf_counter() - start
+
+    print("Replayed {} ticks in {:.3f}s ({:.0f} ticks/s)".format(replay.ticks, elapsed,
+                                                                 replay.ticks / max(elapsed, 1e-9)))
+    print("Seconds: {}  High Score: {}  Difficulty: {}".format(state.sec, state.highScore, state.difficulty))
+    for i, character in enumerate(state.characters):
+        print("Player {} ({}): {} mistakes".format(i + 1, character.trueIdentity, character.mistakes))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
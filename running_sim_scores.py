@@ -0,0 +1,243 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Scores
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Keeps every high score run on disk. Scores are appended to a log of fixed size records by a background
+#              thread, so saving never holds up a frame. Every so often the log is compacted: rewritten with the best
+#              scores copied into an index at the front and swapped in with an atomic replace. Loading reads the index
+#              and only the records appended after it, so start up stays fast however long the history gets.
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import heapq
+import os
+import queue
+import struct
+import threading
+import time
+from bisect import insort
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+scoresPath = "high_scores.dat"
+scoresMagic = b"RS2S"
+scoresVersion = 1
+
+# Magic, version, how many records are in the index and how many history records follow it
+scoresHeader = struct.Struct("<4sHHQ")
+
+# One score as (seconds, gamemode, unix time, character name)
+scoreRecord = struct.Struct("<IIq16s")
+
+# Gamemodes are stored as a number
+gamemodes = ("highscore", "multiplayer")
+
+# How many scores are kept in the index, and how many new records there can be before the log is compacted
+topCount = 10
+compactEvery = 1000
+
+# Records read from disk at a time
+readChunk = 2048
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def packScore(score, name, gamemode="highscore", when=None):
+    """Returns one score as record bytes."""
+    if when is None:
+        when = int(time.time())
+    return scoreRecord.pack(score, gamemodes.index(gamemode), when, name.encode("utf-8")[:16])
+
+
+def unpackScore(record):
+    """Returns (score, name, gamemode, unix time) from an unpacked record."""
+    score, gamemode, when, name = record
+    return score, name.rstrip(b"\0").decode("utf-8", "replace"), gamemodes[gamemode], when
+
+
+def bestRecords(records, count=topCount):
+    """Returns the count best unpacked records, highest score first and the earliest run first on a tie."""
+    return heapq.nsmallest(count, records, key=rankKey)
+
+
+def rankKey(record):
+    """Sort key of an unpacked record, best first."""
+    return -record[0], record[2]
+
+
+def readLog(path, count=topCount):
+    """Reads a score log, returns (index records, history length, new record count, best new records). The records
+    after the compacted part are read a chunk at a time and only the count best are kept."""
+    if not os.path.exists(path):
+        return [], 0, 0, []
+    with open(path, "rb") as logFile:
+        header = logFile.read(scoresHeader.size)
+        if len(header) < scoresHeader.size:
+            return [], 0, 0, []
+        magic, version, indexCount, historyCount = scoresHeader.unpack(header)
+        if magic != scoresMagic or version != scoresVersion:
+            raise ValueError("{} is not a version {} score log".format(path, scoresVersion))
+
+        index = list(scoreRecord.iter_unpack(logFile.read(indexCount * scoreRecord.size)))
+        logFile.seek(historyCount * scoreRecord.size, os.SEEK_CUR)
+
+        # Records appended since the last compaction, a torn record at the end (from a crash) is ignored
+        best = []
+        newCount = 0
+        while True:
+            data = logFile.read(readChunk * scoreRecord.size)
+            data = data[:len(data) - len(data) % scoreRecord.size]
+            if not data:
+                break
+            records = list(scoreRecord.iter_unpack(data))
+            newCount += len(records)
+            best = bestRecords(best + records, count)
+    return index, historyCount, newCount, best
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class ScoreStore:
+    """Every score saved so far, with the best kept in memory."""
+    def __init__(self, path=scoresPath, count=topCount, compactAfter=compactEvery):
+        """Constructs a score store object, loading the log at path and starting the thread that writes to it."""
+        self.path = path
+        self.count = count
+        self.compactAfter = compactAfter
+
+        # Best records, highest score first (only the main thread touches this)
+        index, historyCount, newCount, best = readLog(path, count)
+        self.top = [(rankKey(record), record) for record in bestRecords(index + best, count)]
+        self.total = historyCount + newCount
+        self.uncompacted = newCount
+
+        # Records waiting to be written, None stops the thread
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self.runWriter, name="score writer", daemon=True)
+        self.writer.start()
+
+    def add(self, score, name, gamemode="highscore", when=None):
+        """Saves a score, returns straight away. Returns the rank it reached (0 is the best) or None."""
+        data = packScore(score, name, gamemode, when)
+        record = scoreRecord.unpack(data)
+        self.queue.put(data)
+        self.total += 1
+
+        entry = (rankKey(record), record)
+        insort(self.top, entry)
+        if len(self.top) > self.count:
+            self.top.pop()
+        if entry in self.top:
+            return self.top.index(entry)
+        return None
+
+    def best(self):
+        """Returns the best score saved, 0 if there are none."""
+        if not self.top:
+            return 0
+        return self.top[0][1][0]
+
+    def topScores(self):
+        """Returns the best scores as a list of (score, name, gamemode, unix time)."""
+        return [unpackScore(record) for key, record in self.top]
+
+    def history(self):
+        """Yields every score saved to disk as (score, name, gamemode, unix time), oldest first."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as logFile:
+            indexCount = scoresHeader.unpack(logFile.read(scoresHeader.size))[2]
+            logFile.seek(indexCount * scoreRecord.size, os.SEEK_CUR)
+            while True:
+                data = logFile.read(readChunk * scoreRecord.size)
+                data = data[:len(data) - len(data) % scoreRecord.size]
+                if not data:
+                    return
+                for record in scoreRecord.iter_unpack(data):
+                    yield unpackScore(record)
+
+    def flush(self):
+        """Waits until every score added so far is on disk."""
+        self.queue.join()
+
+    def close(self):
+        """Writes anything left, compacts the log if it is due and stops the writer thread."""
+        self.queue.put(None)
+        self.writer.join()
+
+    def runWriter(self):
+        """Appends queued records to the log, runs on the writer thread."""
+        logFile = self.openLog()
+        while True:
+            data = self.queue.get()
+            stop = data is None
+
+            # Write everything that is waiting in one go
+            batch = [] if stop else [data]
+            items = 1
+            while not stop:
+                try:
+                    data = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                items += 1
+                if data is None:
+                    stop = True
+                else:
+                    batch.append(data)
+            if batch:
+                logFile.write(b"".join(batch))
+                logFile.flush()
+                self.uncompacted += len(batch)
+
+            if self.uncompacted >= self.compactAfter or (stop and self.uncompacted):
+                logFile.close()
+                self.compact()
+                logFile = self.openLog()
+
+            for i in range(items):
+                self.queue.task_done()
+            if stop:
+                logFile.close()
+                return
+
+    def openLog(self):
+        """Opens the log for appending, writing an empty header first if it is new."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < scoresHeader.size:
+            with open(self.path, "wb") as logFile:
+                logFile.write(scoresHeader.pack(scoresMagic, scoresVersion, 0, 0))
+        logFile = open(self.path, "r+b")
+
+        # Drop a torn record left at the end by a crash so new records stay aligned
+        size = logFile.seek(0, os.SEEK_END)
+        torn = (size - scoresHeader.size) % scoreRecord.size
+        if torn:
+            logFile.truncate(size - torn)
+            logFile.seek(0, os.SEEK_END)
+        return logFile
+
+    def compact(self):
+        """Rewrites the log with a fresh index of the best scores in front of the full history, then swaps it in with
+        an atomic replace. Runs on the writer thread."""
+        index, historyCount, newCount, best = readLog(self.path, self.count)
+        newIndex = bestRecords(index + best, self.count)
+        tempPath = self.path + ".tmp"
+        with open(self.path, "rb") as oldFile, open(tempPath, "wb") as newFile:
+            newFile.write(scoresHeader.pack(scoresMagic, scoresVersion, len(newIndex), historyCount + newCount))
+            for record in newIndex:
+                newFile.write(scoreRecord.pack(*record))
+
+            # Copy the history and the new records after it as they are
+            oldFile.seek(scoresHeader.size + len(index) * scoreRecord.size)
+            remaining = (historyCount + newCount) * scoreRecord.size
+            while remaining:
+                data = oldFile.read(min(remaining, readChunk * scoreRecord.size))
+                newFile.write(data)
+                remaining -= len(data)
+            newFile.flush()
+            os.fsync(newFile.fileno())
+        os.replace(tempPath, self.path)
+        self.uncompacted = 0
@@ -0,0 +1,215 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# Program: Running Simulator 2k19 Tuning
+# Authors: Michael Schmauderer and Jake Rutkowski
+# Description: Plays thousands of headless highscore runs with a scripted bot over a grid of obstacle timers,
+#              background speeds and character speeds, spread over every core with a process pool, and reports how
+#              long the bot survives with each setting. Run from the repository root:
+#              python running_sim_tuning.py [--episodes 200] [--workers N] [--save tuning.json]
+# Date Modified: 5/27/2019
+# Version: 1.1
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Import Libraries
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from running_sim_engine import *
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Global Variables
+
+# The grid that is searched, obstacle timers are in centiseconds and are used at every difficulty, speeds are in
+# pixels per second
+spawnIntervals = (500, 700, 1000, 1500)
+scrollSpeeds = (50, 75, 100)
+characterSpeeds = (125, 175, 225)
+
+# Runs per setting, and runs are stopped once the bot has survived this long
+episodeCount = 200
+maxSeconds = 180
+
+# Runs sent to a worker at a time, enough that sending the work costs little next to playing it
+chunkSize = 25
+
+# Where the bot waits between obstacles, and how far off its timing is (standard deviation in ticks)
+botHomeX = 250
+reactionError = .6
+
+# Percentiles of survival time in the report
+reportPercentiles = (10, 50, 90)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Classes
+
+
+class Bot:
+    """A scripted player that ducks under obstacles that are high enough and jumps over the rest. It reacts to each
+    obstacle a little early or late, like a person would."""
+    def __init__(self, state, character, error=reactionError, seed=0):
+        """Constructs a bot object that plays character."""
+        self.state = state
+        self.character = character
+        self.error = error
+
+        # Kept apart from the game's random numbers so the obstacles don't change with the bot's mistakes
+        self.rng = random.Random("bot {}".format(seed))
+        self.mistimings = {}
+
+    def mistiming(self, obstacleId):
+        """Returns how many ticks early (or late, if negative) the bot reacts to an obstacle."""
+        if obstacleId not in self.mistimings:
+            self.mistimings[obstacleId] = self.rng.gauss(0, self.error)
+        return self.mistimings[obstacleId]
+
+    def inputs(self):
+        """Returns the input mask the bot presses this tick."""
+        state = self.state
+        character = self.character
+        field = state.obstacles
+        bounds = updateBounds(character)
+        crouchTop = character.y - 5 * character.size
+
+        # Distance an obstacle closes in on a jumping character each tick
+        closing = (character.speed + jumpBoost + state.scrollSpeed) * tickSeconds
+
+        for i in range(len(field)):
+            x = field.baseX[i] - field.scroll
+
+            # Already passed
+            if x + field.hitRight[i] < bounds.left:
+                continue
+            gap = x - field.hitLeft[i] - bounds.right
+            mistiming = self.mistiming(field.id[i])
+
+            # Duck if the obstacle passes over a crouching character
+            if field.y[i] + field.hitBottom[i] < crouchTop:
+                if gap < closing * (2 + mistiming):
+                    return downBit
+
+            # Jump so the character is high enough by the time it reaches the obstacle
+            elif gap <= closing * (1.7 + mistiming):
+                return upBit | rightBit
+
+            # Wait for an obstacle that is coming instead of walking past the point to jump at
+            if gap < closing * 6:
+                return 0
+            break
+
+        if character.x < botHomeX:
+            return rightBit
+        return 0
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Functions
+
+
+def runEpisode(seed, spawnInterval, scrollSpeed, characterSpeed, limit=maxSeconds, error=reactionError):
+    """Plays one highscore run with the bot, returns the seconds survived before the first hit (at most limit)."""
+    state = GameState("highscore", seed, scrollSpeed=scrollSpeed, timers=(spawnInterval,) * 3)
+    character = Character(botHomeX, 395, "Jamir", characterSpeed, playerControls[0], 3)
+    state.addCharacter(character)
+    bot = Bot(state, character, error, seed)
+    inputs = state.inputs
+    limitTicks = limit * ticksPerSecond
+    while state.ticks < limitTicks:
+        inputs[0] = bot.inputs()
+        if stepInputs(state, inputs):
+            break
+    return state.ticks / ticksPerSecond
+
+
+def runChunk(setting, seeds, limit, error):
+    """Plays a run for every seed with one (spawn interval, scroll speed, character speed) setting, runs in a worker
+    process. Returns (setting, survival times)."""
+    return setting, [runEpisode(seed, *setting, limit=limit, error=error) for seed in seeds]
+
+
+def percentile(times, p):
+    """Returns the pth percentile of a sorted list."""
+    return times[min(len(times) - 1, len(times) * p // 100)]
+
+
+def summarize(times, limit):
+    """Returns the survival figures of one setting."""
+    times = sorted(times)
+    summary = {"episodes": len(times), "mean": sum(times) / len(times)}
+    for p in reportPercentiles:
+        summary["p{}".format(p)] = percentile(times, p)
+
+    # How many runs reached each difficulty, and how many were never hit
+    for seconds in difficultySeconds:
+        summary["reached{}s".format(seconds)] = sum(1 for t in times if t >= seconds) / len(times)
+    summary["survived"] = sum(1 for t in times if t >= limit) / len(times)
+    return summary
+
+
+def runGrid(intervals=spawnIntervals, speeds=scrollSpeeds, runSpeeds=characterSpeeds, episodes=episodeCount,
+            limit=maxSeconds, error=reactionError, workers=None, seed=0):
+    """Plays every setting in the grid across a process pool, returns a list of (setting, summary). Every setting
+    uses the same seeds so they are compared on the same obstacle patterns."""
+    seeds = [seed * 1000003 + episode for episode in range(episodes)]
+    settings = [(interval, speed, runSpeed) for interval in intervals for speed in speeds for runSpeed in runSpeeds]
+    times = {setting: [] for setting in settings}
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(runChunk, setting, seeds[i:i + chunkSize], limit, error)
+                   for setting in settings for i in range(0, episodes, chunkSize)]
+        for future in as_completed(futures):
+            setting, chunkTimes = future.result()
+            times[setting].extend(chunkTimes)
+
+    return [(setting, summarize(times[setting], limit)) for setting in settings]
+
+
+def formatReport(results):
+    """Returns the results as a table."""
+    columns = ["p{}".format(p) for p in reportPercentiles]
+    lines = ["{:>6} {:>6} {:>6} {:>7} ".format("timer", "scroll", "speed", "mean") +
+             " ".join("{:>6}".format(column) for column in columns) +
+             " ".join(" {:>6}".format(">={}s".format(seconds)) for seconds in difficultySeconds) +
+             " {:>7}".format("never")]
+    for (interval, speed, runSpeed), summary in results:
+        lines.append("{:>6} {:>6} {:>6} {:>7.1f} ".format(interval, speed, runSpeed, summary["mean"]) +
+                     " ".join("{:>6.1f}".format(summary[column]) for column in columns) +
+                     " ".join(" {:>6.0%}".format(summary["reached{}s".format(seconds)])
+                              for seconds in difficultySeconds) +
+                     " {:>7.0%}".format(summary["survived"]))
+    return "\n".join(lines)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main
+
+
+def main():
+    """Runs the grid and prints (and optionally saves) the report."""
+    parser = argparse.ArgumentParser(description="Running Sim 2k19 difficulty tuning")
+    parser.add_argument("--episodes", type=int, default=episodeCount, help="runs per setting")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: every core)")
+    parser.add_argument("--max-seconds", type=int, default=maxSeconds, help="stop runs that survive this long")
+    parser.add_argument("--reaction-error", type=float, default=reactionError,
+                        help="how far off the bot's timing is, in ticks")
+    parser.add_argument("--seed", type=int, default=0, help="seed the runs are generated from")
+    parser.add_argument("--save", help="write the report to this JSON file")
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    results = runGrid(episodes=arguments.episodes, limit=arguments.max_seconds, error=arguments.reaction_error,
+                      workers=arguments.workers, seed=arguments.seed)
+    elapsed = time.perf_counter() - start
+
+    print(formatReport(results))
+    total = len(results) * arguments.episodes
+    print("\n{} runs in {:.1f}s ({:.0f} runs/s) on {} workers".format(total, elapsed, total / elapsed,
+                                                                       arguments.workers or os.cpu_count()))
+
+    if arguments.save:
+        with open(arguments.save, "w") as reportFile:
+            json.dump([{"timer": setting[0], "scroll": setting[1], "speed": setting[2], **summary}
+                       for setting, summary in results], reportFile, indent=2)
+
+
+if __name__ == "__main__":
+    main()